@@ -1,31 +1,32 @@
-import pdfplumber
-from typing_extensions import TypedDict, Annotated, List, Dict, Any
-import operator
-from dotenv import load_dotenv
 import json
-from collections import defaultdict
-import pprint
-from docx import Document
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from main import generate_resume_pdf
+import operator
 import os
-from markitdown import MarkItDown
-import streamlit as st
+import pprint
+import shutil
+import threading
+import time
 
+from dotenv import load_dotenv
+from typing_extensions import TypedDict, Annotated, List, Dict, Any
 
-from langchain.agents import create_agent
-from langchain.messages import SystemMessage, HumanMessage
-from langgraph.graph import StateGraph, START, END
-from langchain_groq import ChatGroq
+import batching
+import cache
+import compaction
+import heuristic
+import jsonstream
+import llm_backends
+import metrics
+import sectioned
+from prompts import DEFAULT_INSTRUCTION, PROMPT_ID, build_messages
+
+# pdfplumber, python-docx, extractor (markitdown), langchain, langgraph,
+# the LLM provider SDK and main (reportlab) are imported where they are used,
+# so importing this module (automate.py, app.py, dispatcher workers) stays cheap.
+# The LLM client and compiled graph are built on first use by get_llm() and
+# get_graph().
 
 load_dotenv()
 
-# client = genai.Client()
-# model_name = "gemini-2.0-flash"
-
-
 class State(TypedDict):
     name: str
     education: Annotated[List[str], operator.add]
@@ -38,14 +39,35 @@ class State(TypedDict):
     parse_data: str
     classified_pages: str
     sections: Annotated[List[str], operator.add]
+    output_file: str
+    file_hash: str
+    metrics: Dict[str, Any]
+    error: str
+    status: str
 
 
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    temperature=0,
-    max_tokens=None,
-    max_retries=2,
-)
+_llm = None
+_graph = None
+_batcher = None
+_init_lock = threading.Lock()
+
+
+def get_llm():
+    """The shared LLM client (llm_backends.LLM_BACKEND), created on first use."""
+    global _llm
+    if _llm is None:
+        with _init_lock:
+            if _llm is None:
+                _llm = llm_backends.create(max_retries=2)
+    return _llm
+
+
+def set_llm(client):
+    """Replace the LLM client (e.g. with a stub); returns the previous one."""
+    global _llm
+    with _init_lock:
+        previous, _llm = _llm, client
+    return previous
 
 
 def get_content(state: State):
@@ -62,6 +84,8 @@ def get_content(state: State):
 
         # -------- PDF --------
         if file_path.lower().endswith(".pdf"):
+            import pdfplumber
+
             print("[INFO] Detected PDF file")
             with pdfplumber.open(file_path) as pdf:
                 print(f"[INFO] Total pages found: {len(pdf.pages)}")
@@ -78,6 +102,8 @@ def get_content(state: State):
 
         # -------- DOCX --------
         elif file_path.lower().endswith(".docx"):
+            from docx import Document
+
             print("[INFO] Detected DOCX file")
             doc = Document(file_path)
             print(f"[INFO] Total paragraphs found: {len(doc.paragraphs)}")
@@ -106,486 +132,331 @@ def get_content(state: State):
         return {**state, "error": str(e), "status": "FAILED"}
 
 
-def get_content_markdown(state: State):
-    file_path = state.get("file_path")
-    md = MarkItDown(enable_plugins=False)  # Set to True to enable plugins
-    # if file_path.endswith(".jpg"):
-    #     md = MarkItDown(llm_client=client, llm_model=model_name)
-    result = md.convert(file_path)
-    print("Markdown content started---------------------------------------")
-    print(result.text_content)
-    state["content"] = result.text_content
-    print("Markdown content ended---------------------------------------")
-    urls = []
-    markdown_text = result.text_content
-    # ---- PDF URLs ----
-    if file_path.lower().endswith(".pdf"):
-        import pdfplumber
-
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                if page.annots:
-                    for annot in page.annots:
-                        uri = annot.get("uri")
-                        if uri:
-                            urls.append(uri)
-
-    elif file_path.lower().endswith(".docx"):
-        from docx import Document
-        from docx.opc.constants import RELATIONSHIP_TYPE as RT
-
-        doc = Document(file_path)
-        for rel in doc.part.rels.values():
-            if rel.reltype == RT.HYPERLINK:
-                urls.append(rel.target_ref)
-
-    if urls:
-        markdown_text += "\n\n---\n**Links found in document:**\n"
-        for url in sorted(set(urls)):
-            markdown_text += f"- {url}\n"
-    print(urls)
-    state["content"] = markdown_text
-    return state
-
-
-def get_content_strutured(state: State):
-    system_prompt = """You are an expert Resume Information Extraction and Normalization Agent.
-
-    Your task is to extract structured resume information from raw resume text and return it in EXACTLY the JSON format defined below.
-
-    STRICT OUTPUT FORMAT (do not change keys outside Skillset, do not add new top-level keys):
-
-    {
-    "resume": {
-    "name": "string",
-    "summary": [
-    "string"
-    ],
-    "sections": {
-    "Career Summary": [
-    "string"
-    ],
-    "Professional History": [
-    {
-    "title": "string",
-    "company": "string",
-    "timespan": "string",
-    "points": [
-    "string"
-    ]
-    }
-    ],
-    "Skillset": {
-    },
-    "Project Showcase": [
-    {
-    "title": "string",
-    "technologies": ["string"],
-    "points": [
-    "string"
-    ]
-    }
-    ],
-    "Education": [
-    "string"
-    ]
-    }
-    }
-    }
-
-    ──────────────── EXTRACTION RULES ────────────────
-
-    NAME
-
-    Extract the candidate’s full name from the top of the resume.
-
-    If not found, return an empty string.
-
-    SUMMARY
-
-    Extract 2–4 concise sentences describing the professional profile.
-
-    Do NOT include achievements, metrics, years, company names, or education.
-
-    Normalize wording while preserving meaning.
-
-    ──────────────── CONTACT DETAILS (MANDATORY) ────────────────
-
-    You must always return a contact object with all keys present.
-
-    If a value is missing, return "None" (string).
-
-    Phone
-
-    Extract phone number if present.
-
-    Normalize spacing.
-
-    If not found → "None".
-
-    Email
-
-    Extract email if present.
-
-    Normalize to lowercase.
-
-    If not found → "None".
-
-    LinkedIn
-    The resume may contain:
-
-    Full URL
-    https://linkedin.com/in/username
-
-    Partial URL
-    linkedin.com/in/username
-
-    Username only
-    username
-
-    Text like
-    LinkedIn: username
-
-    Normalization rule:
-
-    If only a username is found, convert it to:
-    https://linkedin.com/in/{{username}}
-
-    If nothing related to LinkedIn exists → "None".
-
-    GitHub
-    The resume may contain:
-
-    Full URL
-    https://github.com/username
-
-    Username only
-    username
-
-    Text like
-    GitHub: username
-
-    Normalization rule:
-
-    If only a username is found, convert it to:
-    https://github.com/{{username}}
-
-    If nothing related to GitHub exists → "None".
-
-    Location
-
-    Extract city, state, or country if explicitly present.
-
-    Do NOT infer or guess.
-
-    If not found → "None".
-
-    ❗ Do NOT hallucinate any contact information.
-
-    CAREER SUMMARY
-
-    Convert experience descriptions into bullet points.
-
-    Each bullet must be a single concise sentence.
-
-    Do NOT include dates, company names, or education.
-
-    EDUCATION
-
-    Extract only formal academic degrees.
-
-    Include degree, institution, and location if present.
-
-    Do NOT include:
-
-    Courses
-
-    Certifications
-
-    Training programs
-
-    Do NOT include years.
-
-    If no valid academic education exists, return an empty array.
-
-    PROFESSIONAL HISTORY
-
-    Extract work experience with job titles, companies, and time spans.
-
-    Each entry must include:
-
-    title (job position)
-
-    company (organization name)
-
-    timespan (employment duration, e.g., "Jan 2023 - Present")
-
-    points (array of achievements/responsibilities)
-
-    Include specific dates when available.
-
-    If no work experience exists, return an empty array.
-
-    PROJECT SHOWCASE
-
-    Each project must include:
-
-    title
-
-    technologies (array)
-
-    points (array of complete sentences)
-
-    Projects must represent real implementations.
-
-    If no valid projects exist, return an empty array.
-
-    ──────────────── SKILLSET (HIERARCHICAL & FLEXIBLE) ────────────────
-
-    Skillset must be a nested object with logical parent domains and sub-categories.
-
-    Parent Categories (create only if relevant)
-
-    Examples (not exhaustive):
-
-    UI
-
-    Backend
+def extract_markdown(reader, label):
+    """Markdown for an open DocumentReader, served from the result cache when possible.
 
-    AI / ML
-
-    Data
-
-    Cloud
-
-    DevOps
-
-    Tools
-
-    Do NOT create a category if the resume does not support it.
-
-    UI (if applicable)
-
-    Allowed sub-categories:
-
-    Frontend Frameworks
-
-    Animation Libraries
-
-    CSS Libraries
-
-    UI Component Libraries
-
-    Examples:
-
-    Frontend Frameworks: React, Angular, Next.js
-
-    Animation Libraries: Anime.js, Framer Motion
-
-    CSS Libraries: Tailwind CSS, Bootstrap
-
-    UI Component Libraries: ShadCN UI, Material UI
-
-    Backend (if applicable)
-
-    Allowed sub-categories:
-
-    Server Runtime
-
-    Backend Frameworks / Libraries
-
-    Databases
-
-    Caching Systems
-
-    Message Queues
-
-    Rules:
-
-    Databases must be grouped by type inside Databases:
-
-    SQL
-
-    NoSQL
-
-    Vector
-
-    Example:
-
-    Server Runtime: Node.js, Go
-
-    Backend Frameworks / Libraries: Express, Gin, Echo
-
-    Databases:
-
-    SQL: PostgreSQL, CockroachDB
-
-    NoSQL: MongoDB, Cassandra
-
-    Vector: PgVector, Pinecone
-
-    Caching Systems: Redis
-
-    AI / ML (if applicable)
-
-    Allowed sub-categories:
-
-    ML Libraries
-
-    Models / LLMs Used
-
-    MLOps Tools
-
-    Examples:
-
-    ML Libraries: PyTorch, TensorFlow
-
-    Models / LLMs Used: Gemini, Groq, Grok
-
-    MLOps Tools: MLflow, DVC
-
-    Data (if applicable)
-
-    Allowed sub-categories:
-
-    Data Science Libraries
-
-    Visualization Tools
-
-    Examples:
-
-    Data Science Libraries: Pandas, NumPy, Polars
-
-    Visualization Tools: Matplotlib, Seaborn
-
-    Cloud (if applicable)
-
-    Allowed sub-categories:
-
-    Cloud Platforms
-
-    Cloud Services
-
-    Examples:
-
-    Cloud Platforms: AWS, Azure
-
-    Cloud Services: ECS, Lambda, EKS
-
-    DevOps (if applicable)
-
-    Allowed sub-categories:
-
-    CI / CD
-
-    Containerization & Orchestration
-
-    Monitoring & Logging
-
-    Infrastructure Tools
-
-    Examples:
+    Returns ``(file_hash, markdown)``.
+    """
+    from extractor import EXTRACT_VERSION
 
-    CI / CD: Jenkins, GitHub Actions
+    file_hash = reader.content_hash()
+    key = cache.cache_key(file_hash, EXTRACT_VERSION)
 
-    Containerization & Orchestration: Docker, Kubernetes, Helm
+    result_cache = cache.get_cache()
+    if result_cache:
+        cached = result_cache.get(cache.MARKDOWN, key)
+        if cached is not None:
+            print(f"[CACHE] Markdown hit for {label}")
+            return file_hash, cached
 
-    Monitoring & Logging: Grafana, Prometheus
+    document = reader.extract()
+    print("Markdown content started---------------------------------------")
+    print(document.text)
+    print("Markdown content ended---------------------------------------")
+    print(document.links)
+    markdown_text = document.to_markdown()
+    if result_cache:
+        result_cache.put(cache.MARKDOWN, key, markdown_text)
+    return file_hash, markdown_text
 
-    Infrastructure Tools: Ansible, Terraform
 
-    Skillset Rules (MANDATORY)
+def _text_bytes(text):
+    return len((text or "").encode("utf-8"))
 
-    Do NOT invent skills.
-    If in subcategories there are no values Please remote the category 
 
-    Do NOT duplicate skills across categories.
+def _json_bytes(data):
+    return len(json.dumps(data).encode("utf-8")) if data else 0
 
-    Normalize names (e.g., PostgresSQL → PostgreSQL).
 
-    Each sub-category value must be an array of strings.
+@metrics.timed_node(
+    "parse",
+    bytes_in=lambda s: os.path.getsize(s["file_path"]),
+    bytes_out=lambda s: _text_bytes(s.get("content")),
+)
+def get_content_markdown(state: State):
+    from extractor import DocumentReader
 
-    Nested grouping (e.g., SQL / NoSQL) must be objects with arrays.
+    file_path = state.get("file_path")
 
-    Do NOT output empty parent categories or empty sub-categories.
+    # The file is read once; the same buffer feeds the cache key and the parser.
+    with DocumentReader(file_path) as reader:
+        state["file_hash"], state["content"] = extract_markdown(reader, file_path)
+    return state
 
-    Skillset is the only section allowed to have nested objects.
 
-    ──────────────── OUTPUT RULES (MANDATORY) ────────────────
+def _structured_key(state):
+    return cache.cache_key(
+        state["file_hash"],
+        PROMPT_ID,
+        llm_backends.MODEL_NAME,
+        compaction.cache_tag(),
+        sectioned.cache_tag(),
+    )
+
+
+def llm_content(state):
+    """The resume text sent to the LLM: ``state["content"]`` after compaction."""
+    if not compaction.COMPACT_ENABLED:
+        return state["content"]
+    content, stats = compaction.compact(state["content"])
+    metrics.compaction_usage(state, stats)
+    print(
+        f"[INFO] Compacted LLM input from ~{stats['tokens_before']} to ~{stats['tokens_after']} tokens "
+        f"({stats['lines_dropped']} line(s) dropped, {stats['lines_trimmed']} trimmed)"
+    )
+    return content
+
+
+def parse_llm_json(text):
+    """Parse the JSON object in a completion (code fences and preambles are skipped)."""
+    return jsonstream.loads(text)
+
+
+def stream_completion(state, messages):
+    """Stream one completion through a ResumeStreamParser; returns ``(parser, response)``."""
+    started = time.perf_counter()
+    parser, response = jsonstream.ResumeStreamParser(), None
+    for chunk in get_llm().stream(messages):
+        parser.feed(chunk.content)
+        response = chunk if response is None else response + chunk
+    metrics.llm_call(state, response, time.perf_counter() - started)
+    print("=================== Raw Response from LLM =======================")
+    print(parser.buffer)
+    return parser, response
+
+
+def extract_structured(state, content):
+    """One streamed call, then follow-up calls only for fields that were cut off or invalid."""
+    extraction = jsonstream.Extraction()
+    responses = []
+    for _ in range(1 + jsonstream.JSON_REPAIR_ATTEMPTS):
+        instruction = extraction.next_instruction(DEFAULT_INSTRUCTION)
+        if instruction is None:
+            break
+        parser, response = stream_completion(state, build_messages(content, instruction))
+        responses.append(response)
+        extraction.add(parser)
+    metrics.llm_usage(state, *responses)
+    return extraction.result()
+
+
+def extract_sections(state, groups):
+    """Section-parallel extraction: one call per group, run concurrently, then merged."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def call(group):
+        with sectioned.SECTION_SLOTS:
+            started = time.perf_counter()
+            response = get_llm().invoke(
+                build_messages(groups[group], sectioned.instruction(group))
+            )
+            metrics.llm_call(state, response, time.perf_counter() - started)
+        return response
+
+    print(f"[INFO] Extracting {len(groups)} section group(s) in parallel: {', '.join(groups)}")
+    with ThreadPoolExecutor(max_workers=min(sectioned.SECTION_WORKERS, len(groups))) as pool:
+        responses = dict(zip(groups, pool.map(call, groups)))
+    metrics.llm_usage(state, *responses.values())
+    return sectioned.merge(
+        {group: parse_llm_json(response.content) for group, response in responses.items()}
+    )
+
+
+def cached_parse_data(state):
+    result_cache = cache.get_cache() if state.get("file_hash") else None
+    if result_cache:
+        cached = result_cache.get(cache.PARSE_DATA, _structured_key(state))
+        if cached is not None:
+            print("[CACHE] parse_data hit")
+            return json.loads(cached)
+    return None
+
+
+def store_parse_data(state):
+    result_cache = cache.get_cache() if state.get("file_hash") else None
+    if result_cache:
+        result_cache.put(
+            cache.PARSE_DATA, _structured_key(state), json.dumps(state["parse_data"])
+        )
 
-    Output ONLY valid JSON
 
-    No markdown
+@metrics.timed_node(
+    "heuristic",
+    bytes_in=lambda s: _text_bytes(s.get("content")),
+    bytes_out=lambda s: _json_bytes(s.get("parse_data")),
+)
+def get_content_heuristic(state: State):
+    """Structure well-formed resumes with heuristic.extract; the rest go to the LLM."""
+    if not heuristic.HEURISTIC_ENABLED or not state.get("content"):
+        return state
+    try:
+        parse_data, confidence, stats = heuristic.extract(state["content"])
+    except Exception as e:
+        print(f"[WARN] Heuristic extraction failed ({e}); using the LLM")
+        return state
+    accepted = confidence >= heuristic.HEURISTIC_MIN_CONFIDENCE
+    metrics.heuristic_result(state, stats, accepted)
+    if accepted:
+        print(f"[INFO] Heuristic extraction accepted (confidence {confidence}); skipping the LLM")
+        state["parse_data"] = parse_data
+    else:
+        print(f"[INFO] Heuristic confidence {confidence} below {heuristic.HEURISTIC_MIN_CONFIDENCE}; using the LLM")
+    return state
 
-    No explanations
 
-    No comments
+def route_structured(state: State):
+    """Conditional edge after get_content_heuristic: skip the LLM when it succeeded."""
+    return "generate_pdf" if state.get("parse_data") else "get_content_structured"
 
-    No trailing commas
 
-    Do not output anything other than the JSON object"""
+@metrics.timed_node(
+    "llm",
+    bytes_in=lambda s: _text_bytes(s.get("content")),
+    bytes_out=lambda s: _json_bytes(s.get("parse_data")),
+)
+def get_content_strutured(state: State):
     if state["content"]:
         print("Its There")
-    human_prompt = f"""Extract structured resume information from the following raw resume text:
 
-    {state["content"]}
+    cached = cached_parse_data(state)
+    if cached is not None:
+        state["parse_data"] = cached
+        return state
 
-    """
+    content = llm_content(state)
+    batcher = get_batcher()
+    if batcher and batcher.accepts(content):
+        try:
+            state["parse_data"], response, share, seconds = batcher.extract(content)
+            metrics.llm_usage(state, response, share=share)
+            if seconds is not None:  # one job per batch records the shared request
+                metrics.llm_call(state, response, seconds)
+            store_parse_data(state)
+            return state
+        except batching.BatchSkipped:
+            pass
+        except batching.BatchFailed as e:
+            metrics.llm_usage(state, e.response, share=e.share)
+            if e.seconds is not None:
+                metrics.llm_call(state, e.response, e.seconds)
+            print(f"[WARN] Batched extraction failed ({e}); using a single call")
+        except Exception as e:
+            print(f"[WARN] Batched extraction failed ({e}); using a single call")
+
+    groups = sectioned.plan(content)
+    if groups:
+        try:
+            state["parse_data"] = extract_sections(state, groups)
+            store_parse_data(state)
+            return state
+        except Exception as e:
+            print(f"[WARN] Section-parallel extraction failed ({e}); using a single call")
 
     try:
-
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=human_prompt),
-        ]
-
-        response = llm.invoke(messages)
-        jsoncontent = response.content
-
-        if "json" or "```" in jsoncontent.lower():
-            jsoncontent = jsoncontent.strip("```json").strip("```")
-
-        jsoncontent = jsoncontent.strip()
-        print("=================== Raw Response from LLM =======================")
-        print(response.content)
-        print("Json content Conversion Start")
-        jsonResponse = json.loads(jsoncontent)
-        print("Json content Conversion End")
-        state["parse_data"] = jsonResponse
+        state["parse_data"] = extract_structured(state, content)
         pprint.pprint(state["parse_data"])
+        store_parse_data(state)
         return state
     except Exception as e:
-        return f"Error extracting content: {str(e)}"
+        return {**state, "error": str(e), "status": "FAILED"}
 
 
+@metrics.timed_node(
+    "render",
+    bytes_in=lambda s: _json_bytes(s.get("parse_data")),
+    bytes_out=lambda s: os.path.getsize(s["output_file"]),
+)
 def generate_PDF(state: State):
+    from main import RENDER_VERSION, generate_resume_pdf
+
+    if state.get("error"):
+        return state  # an earlier node failed; nothing to render
     print("Called ")
     try:
-        result = generate_resume_pdf(state["parse_data"], show_contact=True)
+        # A caller may choose the destination (e.g. worker.py's per-job path);
+        # only file paths can be served from or stored in the cache.
+        requested = state.get("output_file")
+        cacheable = state.get("file_hash") and (requested is None or isinstance(requested, str))
+        result_cache = cache.get_cache() if cacheable else None
+        key = cache.cache_key(_structured_key(state), RENDER_VERSION) if result_cache else None
+        if result_cache:
+            cached = result_cache.get(cache.PDF_PATH, key)
+            if cached and os.path.exists(cached):
+                if requested and os.path.abspath(requested) != os.path.abspath(cached):
+                    shutil.copyfile(cached, requested)
+                    print(f"[CACHE] PDF hit: {cached}, copied to {requested}")
+                else:
+                    print(f"[CACHE] PDF hit: {cached}")
+                    state["output_file"] = cached
+                return state
+
+        result = generate_resume_pdf(
+            state["parse_data"], show_contact=True, output_file=requested
+        )
         print(result)
+        state["output_file"] = result
+        if result_cache:
+            result_cache.put(cache.PDF_PATH, key, result)
         return state
     except Exception as e:
-        return f"Error extracting content: {str(e)}"
+        return {**state, "error": str(e), "status": "FAILED"}
+
+
+def get_batcher():
+    """The process-wide LLMBatcher, or None unless LLM_BATCH=1."""
+    global _batcher
+    if not batching.BATCH_ENABLED:
+        return None
+    with _init_lock:
+        if _batcher is None:
+            _batcher = batching.LLMBatcher(
+                lambda messages: get_llm().invoke(messages), build_messages
+            )
+    return _batcher
+
+
+def build_graph():
+    from langgraph.graph import StateGraph, START, END
+
+    workflow = StateGraph(State)
 
+    workflow.add_node("generate_pdf", generate_PDF)
+    workflow.add_node("get_content", get_content)
+    workflow.add_node("get_content_markdown", get_content_markdown)
+    workflow.add_node("get_content_heuristic", get_content_heuristic)
+    workflow.add_node("get_content_structured", get_content_strutured)
+    # workflow.add_node("get_experience", get_experience)
+    # workflow.add_node("get_sections", get_sections)
 
-workflow = StateGraph(State)
+    workflow.add_edge(START, "get_content_markdown")
+    workflow.add_edge("get_content_markdown", "get_content_heuristic")
+    workflow.add_conditional_edges(
+        "get_content_heuristic", route_structured, ["get_content_structured", "generate_pdf"]
+    )
+    workflow.add_edge("get_content_structured", "generate_pdf")
+    workflow.add_edge("generate_pdf", END)
 
-workflow.add_node("generate_pdf", generate_PDF)
-workflow.add_node("get_content", get_content)
-workflow.add_node("get_content_markdown", get_content_markdown)
-workflow.add_node("get_content_structured", get_content_strutured)
-# workflow.add_node("get_experience", get_experience)
-# workflow.add_node("get_sections", get_sections)
+    # workflow.add_edge("get_content_markdown",END)
+    return workflow
 
-workflow.add_edge(START, "get_content_markdown")
-workflow.add_edge("get_content_markdown", "get_content_structured")
-workflow.add_edge("get_content_structured", "generate_pdf")
-workflow.add_edge("generate_pdf", END)
 
+def get_graph():
+    """The compiled pipeline graph, built once per process."""
+    global _graph
+    if _graph is None:
+        with _init_lock:
+            if _graph is None:
+                _graph = build_graph().compile()
+    return _graph
 
-# workflow.add_edge("get_content_markdown",END)
 
-graph = workflow.compile()
+def __getattr__(name):
+    # ``agent.llm`` / ``agent.graph`` keep working for existing callers.
+    if name == "llm":
+        return get_llm()
+    if name == "graph":
+        return get_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # response = graph.invoke(
@@ -606,7 +477,7 @@ INPUT_DIR = "ResumeFolder"
 
 def get_response(file_path) -> str:
     try:
-        response = graph.invoke(
+        response = get_graph().invoke(
             {
                 "file_path": file_path,
             }
@@ -614,4 +485,6 @@ def get_response(file_path) -> str:
         print("TRue")
     except Exception as e:
         return f"Error extracting content: {str(e)}"
+    if response.get("error"):
+        return f"Error extracting content: {response['error']}"
     return f"the file named {file_path} is created"
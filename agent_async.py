@@ -0,0 +1,227 @@
+import asyncio
+import os
+import pprint
+import sys
+import time
+
+import agent
+import jsonstream
+import llm_backends
+import metrics
+import prompts
+import sectioned
+from agent import State
+from ratelimit import LLMScheduler, LLM_EXPECTED_OUTPUT_TOKENS, estimate_tokens
+
+PIPELINE_CONCURRENCY = int(os.getenv("PIPELINE_CONCURRENCY", "16"))
+
+_async_llm = None
+_async_graph = None
+_scheduler = None
+_scheduler_loop = None
+
+
+def get_async_llm():
+    """LLM client for the async graph, created on first use.
+
+    Retries are driven by LLMScheduler (jittered backoff on 429s), so the
+    client itself does not retry.
+    """
+    global _async_llm
+    if _async_llm is None:
+        _async_llm = llm_backends.create(max_retries=0)
+    return _async_llm
+
+
+def get_scheduler():
+    """One scheduler per event loop, shared by every job running on it."""
+    global _scheduler, _scheduler_loop
+    loop = asyncio.get_running_loop()
+    if _scheduler is None or _scheduler_loop is not loop:
+        _scheduler = LLMScheduler()
+        _scheduler_loop = loop
+    return _scheduler
+
+
+def _raise_on_error(node, result):
+    # The sync nodes report failures by returning a string or an "error" key.
+    if not isinstance(result, dict):
+        raise RuntimeError(f"{node}: {result}")
+    if result.get("error"):
+        raise RuntimeError(f"{node}: {result['error']}")
+    return result
+
+
+async def aget_content_markdown(state: State):
+    result = await asyncio.to_thread(agent.get_content_markdown, state)
+    return _raise_on_error("get_content_markdown", result)
+
+
+async def _ainvoke(state, content, instruction=prompts.DEFAULT_INSTRUCTION, expected_output=LLM_EXPECTED_OUTPUT_TOKENS):
+    messages = prompts.build_messages(content, instruction)
+    estimated = estimate_tokens(prompts.SYSTEM_PROMPT + content) + expected_output
+
+    async def call():
+        started = time.perf_counter()
+        response = await get_async_llm().ainvoke(messages)
+        metrics.llm_call(state, response, time.perf_counter() - started)
+        return response
+
+    return await get_scheduler().run(call, estimated)
+
+
+async def _astream(state, content, instruction=prompts.DEFAULT_INSTRUCTION):
+    """Async counterpart of agent.stream_completion; returns ``(parser, response)``."""
+    messages = prompts.build_messages(content, instruction)
+    estimated = estimate_tokens(prompts.SYSTEM_PROMPT + content) + LLM_EXPECTED_OUTPUT_TOKENS
+    parser = None
+
+    async def call():
+        nonlocal parser
+        started = time.perf_counter()
+        parser, response = jsonstream.ResumeStreamParser(), None  # fresh on every retry
+        async for chunk in get_async_llm().astream(messages):
+            parser.feed(chunk.content)
+            response = chunk if response is None else response + chunk
+        metrics.llm_call(state, response, time.perf_counter() - started)
+        return response
+
+    response = await get_scheduler().run(call, estimated)
+    return parser, response
+
+
+async def aextract_structured(state, content):
+    """Async counterpart of agent.extract_structured; returns (parse_data, responses)."""
+    extraction = jsonstream.Extraction()
+    responses = []
+    for _ in range(1 + jsonstream.JSON_REPAIR_ATTEMPTS):
+        instruction = extraction.next_instruction(prompts.DEFAULT_INSTRUCTION)
+        if instruction is None:
+            break
+        parser, response = await _astream(state, content, instruction)
+        responses.append(response)
+        extraction.add(parser)
+    metrics.llm_usage(state, *responses)
+    return extraction.result(), responses
+
+
+async def aextract_sections(state, groups):
+    """Async counterpart of agent.extract_sections; returns (parse_data, responses)."""
+    expected = LLM_EXPECTED_OUTPUT_TOKENS // len(groups)
+    responses = await asyncio.gather(
+        *(_ainvoke(state, text, sectioned.instruction(group), expected) for group, text in groups.items())
+    )
+    metrics.llm_usage(state, *responses)
+    parse_data = sectioned.merge(
+        {group: agent.parse_llm_json(r.content) for group, r in zip(groups, responses)}
+    )
+    return parse_data, responses
+
+
+async def aget_content_strutured(state: State):
+    started = time.perf_counter()
+    content_bytes = len(state["content"].encode("utf-8"))
+    cached = agent.cached_parse_data(state)
+    if cached is not None:
+        state["parse_data"] = cached
+        metrics.stage_metrics(state, "llm", time.perf_counter() - started, content_bytes, 0)
+        return state
+
+    content = agent.llm_content(state)
+    responses = None
+    groups = sectioned.plan(content)
+    if groups:
+        try:
+            state["parse_data"], responses = await aextract_sections(state, groups)
+        except Exception as e:
+            print(f"[WARN] Section-parallel extraction failed ({e}); using a single call")
+    if responses is None:
+        state["parse_data"], responses = await aextract_structured(state, content)
+    pprint.pprint(state["parse_data"])
+    agent.store_parse_data(state)
+    metrics.stage_metrics(
+        state,
+        "llm",
+        time.perf_counter() - started,
+        content_bytes,
+        sum(len(r.content.encode("utf-8")) for r in responses),
+    )
+    return state
+
+
+async def agenerate_PDF(state: State):
+    result = await asyncio.to_thread(agent.generate_PDF, state)
+    return _raise_on_error("generate_pdf", result)
+
+
+def get_async_graph():
+    """The compiled async pipeline graph, built on first use."""
+    global _async_graph
+    if _async_graph is None:
+        from langgraph.graph import StateGraph, START, END
+
+        async_workflow = StateGraph(State)
+
+        async_workflow.add_node("get_content_markdown", aget_content_markdown)
+        async_workflow.add_node("get_content_heuristic", agent.get_content_heuristic)  # CPU-light
+        async_workflow.add_node("get_content_structured", aget_content_strutured)
+        async_workflow.add_node("generate_pdf", agenerate_PDF)
+
+        async_workflow.add_edge(START, "get_content_markdown")
+        async_workflow.add_edge("get_content_markdown", "get_content_heuristic")
+        async_workflow.add_conditional_edges(
+            "get_content_heuristic",
+            agent.route_structured,
+            ["get_content_structured", "generate_pdf"],
+        )
+        async_workflow.add_edge("get_content_structured", "generate_pdf")
+        async_workflow.add_edge("generate_pdf", END)
+
+        _async_graph = async_workflow.compile()
+    return _async_graph
+
+
+async def aget_response(file_path) -> str:
+    started = time.perf_counter()
+    try:
+        state = await get_async_graph().ainvoke({"file_path": file_path})
+    except Exception as e:
+        metrics.record_job(
+            None,
+            "failed",
+            source="async",
+            total_seconds=round(time.perf_counter() - started, 4),
+            error=str(e),
+            file_path=file_path,
+        )
+        return f"Error extracting content: {str(e)}"
+    metrics.record_job(
+        state.get("metrics"),
+        "done",
+        source="async",
+        total_seconds=round(time.perf_counter() - started, 4),
+        file_path=file_path,
+        output_file=state.get("output_file"),
+    )
+    return f"the file named {file_path} is created"
+
+
+async def run_many(file_paths, concurrency=PIPELINE_CONCURRENCY):
+    """Run the async graph over many files; LLM calls share one scheduler."""
+    gate = asyncio.Semaphore(concurrency)
+
+    async def run_one(path):
+        async with gate:
+            return await aget_response(path)
+
+    return await asyncio.gather(*(run_one(p) for p in file_paths))
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or [
+        os.path.join(agent.INPUT_DIR, f)
+        for f in sorted(os.listdir(agent.INPUT_DIR))
+        if f.lower().endswith((".pdf", ".docx"))
+    ]
+    for line in asyncio.run(run_many(paths)):
+        print(line)
@@ -0,0 +1,175 @@
+import hashlib
+import io
+import json
+import os
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+
+import metrics
+from jobs import DONE, UPLOAD_DIR, JobQueue
+from status import get_status_store
+
+VALID_EXTS = (".pdf", ".docx")
+
+app = FastAPI(title="Resume Standard")
+
+_queue = None
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+        metrics.REGISTRY.gauge(
+            "resume_jobs_by_status", "Jobs in the queue by status", _queue.counts, label="status"
+        )
+    return _queue
+
+
+def _pdf_response(pdf_bytes, name):
+    filename = re.sub(r"[^A-Za-z0-9_.-]+", "_", name or "resume") + ".pdf"
+    return StreamingResponse(
+        io.BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Endpoints are plain ``def`` so FastAPI runs the blocking pipeline in its
+# threadpool; the renderer keeps per-document state and is thread safe.
+
+
+@app.post("/render")
+def render(parse_data: dict, show_contact: bool = True):
+    """Render already-extracted ``{"resume": {...}}`` JSON straight to the client."""
+    from main import render_resume_bytes
+
+    if "resume" not in parse_data:
+        raise HTTPException(status_code=422, detail='Body must contain a "resume" object')
+    pdf_bytes = render_resume_bytes(parse_data, show_contact=show_contact)
+    return _pdf_response(pdf_bytes, parse_data["resume"].get("name"))
+
+
+@app.post("/convert")
+def convert(file: UploadFile = File(...), show_contact: bool = True):
+    """Extract, structure and render an uploaded resume without touching disk."""
+    import agent
+    from extractor import DocumentReader
+    from main import render_resume_bytes
+
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in VALID_EXTS:
+        raise HTTPException(status_code=415, detail="Only .pdf and .docx are supported")
+
+    started = time.perf_counter()
+    data = file.file.read()
+    with DocumentReader(data=data, extension=extension) as reader:
+        file_hash, content = agent.extract_markdown(reader, file.filename)
+    parsed = {"content": content, "file_hash": file_hash}
+    metrics.stage_metrics(
+        parsed, "parse", time.perf_counter() - started, len(data), len(content.encode("utf-8"))
+    )
+
+    parsed = agent.get_content_heuristic(parsed)
+    if agent.route_structured(parsed) == "generate_pdf":
+        state = parsed
+    else:
+        state = agent.get_content_strutured(parsed)
+    if not isinstance(state, dict) or state.get("error"):
+        error = state["error"] if isinstance(state, dict) else state
+        metrics.record_job(
+            parsed.get("metrics"),
+            "failed",
+            source="api",
+            total_seconds=round(time.perf_counter() - started, 4),
+            error=error,
+            failed_stage="llm",
+            filename=file.filename,
+        )
+        raise HTTPException(status_code=502, detail=error)
+
+    render_started = time.perf_counter()
+    pdf_bytes = render_resume_bytes(state["parse_data"], show_contact=show_contact)
+    metrics.stage_metrics(
+        state,
+        "render",
+        time.perf_counter() - render_started,
+        len(json.dumps(state["parse_data"]).encode("utf-8")),
+        len(pdf_bytes),
+    )
+    metrics.record_job(
+        state.get("metrics"),
+        "done",
+        source="api",
+        total_seconds=round(time.perf_counter() - started, 4),
+        filename=file.filename,
+    )
+    return _pdf_response(pdf_bytes, state["parse_data"].get("resume", {}).get("name"))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint for this API process."""
+    get_queue()  # registers the job queue gauges
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ---------------- JOBS ----------------
+
+
+@app.post("/jobs", status_code=202)
+def submit_job(file: UploadFile = File(...)):
+    """Queue an uploaded resume for the worker pool (see worker.py).
+
+    Uploads are stored by content hash, so resubmitting the same file returns
+    the job that already exists for it.
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in VALID_EXTS:
+        raise HTTPException(status_code=415, detail="Only .pdf and .docx are supported")
+
+    data = file.file.read()
+    file_hash = hashlib.sha256(data).hexdigest()
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    upload_path = os.path.join(UPLOAD_DIR, file_hash + extension)
+    if not os.path.exists(upload_path):
+        tmp_path = f"{upload_path}.{uuid.uuid4().hex}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, upload_path)  # workers never see a partial upload
+
+    job, created = get_queue().submit(file_hash, file.filename, upload_path)
+    status = get_status_store()
+    if created and status:
+        status.job_queued(job["id"], file.filename, "api")
+    return {**job, "deduplicated": not created}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = get_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/pdf")
+def get_job_pdf(job_id: str):
+    job = get_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != DONE or not job["output_file"] or not os.path.exists(job["output_file"]):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return FileResponse(
+        job["output_file"], media_type="application/pdf", filename=f"{job_id}.pdf"
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", "8000")))
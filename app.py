@@ -1,15 +1,24 @@
 import streamlit as st
+import math
 import os
 import threading
+from datetime import datetime
 from pathlib import Path
 import time
-from automate import start_watchdog  # ✅ Import non-blocking starter
+
+from status import DONE, FAILED, get_status_store
 
 # ---------------- CONFIG ----------------
 
 INPUT_DIR = "ResumeFolder"
 OUTPUT_DIR = "OutputFolder"
 VALID_EXTS = (".pdf", ".docx")
+PAGE_SIZE = int(os.getenv("APP_PAGE_SIZE", "20"))
+JOB_STATUSES = ["All", "processing", "done", "failed", "missing"]
+# seconds between status panel polls; only rows changed since the last poll are read
+STATUS_REFRESH_SECONDS = float(os.getenv("APP_STATUS_REFRESH", "2"))
+STATUS_RECENT = int(os.getenv("APP_STATUS_RECENT", "200"))
+THROUGHPUT_WINDOW = 300
 
 # ---------------- SETUP ----------------
 
@@ -20,19 +29,170 @@ st.set_page_config(page_title="Resume Processor", layout="wide")
 st.title("📁 Resume Folder Processor")
 st.caption("Upload folders or files · Auto-processed via LangGraph")
 
+# ---------------- HELPERS ----------------
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def list_directory(directory, version):
+    """Name/size/mtime of the files in ``directory`` (no contents are read).
+
+    ``version`` is the directory's mtime, so adding, removing or renaming a
+    file invalidates the cached listing.
+    """
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append({"name": entry.name, "size": stat.st_size, "mtime": stat.st_mtime})
+    return sorted(files, key=lambda f: f["name"].lower())
+
+
+def directory_version(directory):
+    return os.stat(directory).st_mtime_ns
+
+
+@st.cache_resource
+def get_ledger():
+    from ledger import FileLedger
+
+    return FileLedger()
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def paginate(total, key):
+    """Page picker; returns the offset of the first row to show."""
+    pages = max(1, math.ceil(total / PAGE_SIZE))
+    if pages == 1:
+        return 0
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    return (page - 1) * PAGE_SIZE
+
+
+def download_button(path, key):
+    # ``data`` is a callable, so the file is only read when the user clicks.
+    st.download_button(
+        "⬇️ Download",
+        Path(path).read_bytes,
+        os.path.basename(path),
+        key=key,
+        on_click="ignore",
+    )
+
+
+def file_listing(directory, key, empty_message):
+    query = st.text_input("Filter by name", key=f"{key}-filter")
+    files = list_directory(directory, directory_version(directory))
+    if query:
+        files = [f for f in files if query.lower() in f["name"].lower()]
+    if not files:
+        st.warning(empty_message)
+        return
+
+    start = paginate(len(files), f"{key}-page")
+    st.caption(f"{len(files)} file(s)")
+    for f in files[start : start + PAGE_SIZE]:
+        col1, col2, col3 = st.columns([4, 1, 1])
+        col1.text(f["name"])
+        col2.text(human_size(f["size"]))
+        with col3:
+            download_button(os.path.join(directory, f["name"]), f"{key}-{f['name']}")
+
+
+def poll_status(store):
+    """Merge jobs changed since the last poll into ``st.session_state``.
+
+    The first poll only loads the latest STATUS_RECENT jobs; afterwards each
+    poll reads just the rows whose ``seq`` moved past the stored cursor.
+    """
+    if "status_jobs" not in st.session_state:
+        st.session_state.status_jobs = {}
+        st.session_state.status_seq = max(0, store.latest_seq() - STATUS_RECENT)
+
+    jobs = st.session_state.status_jobs
+    changed, st.session_state.status_seq = store.changes(st.session_state.status_seq)
+    for job in changed:
+        jobs.pop(job["job_id"], None)  # re-inserted last, so the dict stays ordered by seq
+        jobs[job["job_id"]] = job
+    while len(jobs) > STATUS_RECENT:
+        del jobs[next(iter(jobs))]
+    return list(jobs.values())
+
+
+def format_timings(timings):
+    return " · ".join(f"{stage} {seconds:.1f}s" for stage, seconds in timings.items())
+
+
+@st.fragment(run_every=STATUS_REFRESH_SECONDS)
+def status_panel():
+    observer = st.session_state.get("watchdog_observer")
+    if observer is not None and observer.is_alive():
+        st.success("Watcher is running")
+    else:
+        st.error("Watcher is not running")
+
+    store = get_status_store()
+    if store is None:
+        st.info("Live status is disabled (STATUS_ENABLED=0).")
+        return
+
+    jobs = poll_status(store)
+    gauges = store.gauges()
+    summary = store.summary(THROUGHPUT_WINDOW)
+    col1, col2, col3, col4 = st.columns(4)
+    backlog = sum(gauges.get(name, {}).get("value", 0) for name in ("dispatch_queue_depth", "jobs_queued"))
+    col1.metric("Backlog", int(backlog))
+    col2.metric("In flight", int(gauges.get("dispatch_in_flight", {}).get("value", 0)))
+    col3.metric("Done / min", f"{summary['done_per_minute']:.1f}")
+    col4.metric(f"Failed (last {THROUGHPUT_WINDOW // 60} min)", summary["failed_in_window"])
+
+    now = time.time()
+    active = [job for job in jobs if job["status"] not in (DONE, FAILED)]
+    if active:
+        st.markdown("**In progress**")
+        for job in reversed(active):
+            col1, col2, col3 = st.columns([4, 1, 2])
+            col1.text(os.path.basename(job["file_path"] or job["job_id"]))
+            col2.text(job["stage"] or job["status"])
+            col3.text(f"{now - job['started_at']:.0f}s · {format_timings(job['timings'])}")
+
+    finished = [job for job in jobs if job["status"] in (DONE, FAILED)][-10:]
+    if finished:
+        st.markdown("**Recently finished**")
+        for job in reversed(finished):
+            col1, col2, col3 = st.columns([4, 1, 2])
+            col1.text(os.path.basename(job["file_path"] or job["job_id"]))
+            col2.text("✅ done" if job["status"] == DONE else "❌ failed")
+            col3.text(format_timings(job["timings"]))
+            if job["error"]:
+                st.caption(f"❌ {job['error']}")
+    elif not active:
+        st.caption("No jobs yet.")
+
+
 # ---------------- START WATCHDOG (ONCE) ----------------
 
 if "watchdog_observer" not in st.session_state:
     st.session_state.watchdog_observer = None
 
 if st.session_state.watchdog_observer is None:
+    # Imported here so Streamlit reruns never pay for the pipeline imports.
+    from automate import start_watchdog  # ✅ Import non-blocking starter
+
     st.session_state.watchdog_observer = start_watchdog()
     st.success("✅ Background processor started!")
 
 # ---------------- STATUS ----------------
 
 st.subheader("🟢 Background Processor Status")
-st.success("automate.py is running")
+status_panel()
 
 # ---------------- UPLOAD SECTION ----------------
 
@@ -50,64 +210,65 @@ if uploaded_files:
         filename = os.path.basename(file.name)
         dest_path = os.path.join(INPUT_DIR, filename)
 
-        with open(dest_path, "wb") as f:
+        # Write under a temp name and rename, so the watcher never sees a
+        # half-written resume.
+        tmp_path = os.path.join(INPUT_DIR, f".{filename}.part")
+        with open(tmp_path, "wb") as f:
             f.write(file.getbuffer())
-    
+        os.replace(tmp_path, dest_path)
+
         st.success(f"Added: {filename}")
+    list_directory.clear()
     # runThread() # Removed: Watchdog is already running in background
     st.info("Files stored in ResumeFolder. Processing will begin automatically.")
 
-# ---------------- INPUT FILES ----------------
+# ---------------- JOBS ----------------
 
 st.divider()
-st.subheader("📂 Input Files (ResumeFolder)")
+st.subheader("🗂️ Jobs")
 
-input_files = sorted(Path(INPUT_DIR).glob("*"))
+col1, col2 = st.columns([3, 1])
+job_query = col1.text_input("Search jobs by file name", key="jobs-filter")
+job_status = col2.selectbox("Status", JOB_STATUSES, key="jobs-status")
+status_filter = None if job_status == "All" else job_status
 
-if not input_files:
-    st.warning("No input files found.")
+ledger = get_ledger()
+_, job_total = ledger.search(job_query, status_filter, limit=0)
+if not job_total:
+    st.info("No jobs match.")
 else:
-    print("Got input files")
-    for file in input_files:
-        col1, col2 = st.columns([4, 1])
-        col1.text(file.name)
-
-        with col2:
-            with open(file, "rb") as f:
-                st.download_button(
-                    "⬇️ Download",
-                    f,
-                    file.name,
-                    key=f"in-{file.name}",
-                )
+    offset = paginate(job_total, "jobs-page")
+    jobs, _ = ledger.search(job_query, status_filter, limit=PAGE_SIZE, offset=offset)
+    st.caption(f"{job_total} job(s)")
+    for job in jobs:
+        col1, col2, col3, col4 = st.columns([4, 1, 2, 1])
+        col1.text(os.path.basename(job["path"]))
+        col2.text(job["status"])
+        col3.text(datetime.fromtimestamp(job["updated_at"]).strftime("%Y-%m-%d %H:%M:%S"))
+        output_file = job["output_file"]
+        if output_file and os.path.exists(output_file):
+            with col4:
+                download_button(output_file, f"job-{job['path']}")
+        if job["error"]:
+            st.caption(f"❌ {job['error']}")
 
-# ---------------- OUTPUT FILES ----------------
+# ---------------- INPUT FILES ----------------
 
 st.divider()
-st.subheader("📂 Output Files (OutputFolder)")
+st.subheader("📂 Input Files (ResumeFolder)")
+file_listing(INPUT_DIR, "in", "No input files found.")
 
-output_files = sorted(Path(OUTPUT_DIR).glob("*"))
+# ---------------- OUTPUT FILES ----------------
 
-if not output_files:
-    st.warning("No output files yet.")
-else:
-    for file in output_files:
-        col1, col2 = st.columns([4, 1])
-        col1.text(file.name)
-
-        with col2:
-            with open(file, "rb") as f:
-                st.download_button(
-                    "⬇️ Download",
-                    f,
-                    file.name,
-                    key=f"out-{file.name}",
-                )
+st.divider()
+st.subheader("📂 Output Files (OutputFolder)")
+file_listing(OUTPUT_DIR, "out", "No output files yet.")
 
 # ---------------- MANUAL REFRESH ----------------
 
 st.divider()
 if st.button("🔄 Refresh Output Folder"):
+    list_directory.clear()
     st.rerun()
 
 st.caption("Watchdog monitors ResumeFolder · LangGraph pipeline runs automatically")
@@ -2,60 +2,146 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import time
 import os
-from agent import get_response
+from coalescer import EventCoalescer
+from dispatcher import ResumeDispatcher
+from ledger import FileLedger
+import metrics
+from status import get_status_store
 
 print("Automate file called")
 
 INPUT_DIR = "ResumeFolder"
 OUTPUT_DIR = "OutputFolder"
+VALID_EXTS = (".pdf", ".docx")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+LEDGER_COMPACT_INTERVAL = int(os.getenv("LEDGER_COMPACT_INTERVAL", str(24 * 3600)))
 
 
 class ResumeFolderHandler(FileSystemEventHandler):
-    processed_files = set()
+    """Hands completely written files to the dispatcher.
+
+    Events only feed the coalescer; a file is claimed in the ledger (so each
+    version runs once) when its size and mtime have settled.
+    """
+
+    def __init__(self, dispatcher, ledger):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.ledger = ledger
+        self.coalescer = EventCoalescer(self.on_ready)
+
+    def _touch(self, path, closed=False):
+        if path.lower().endswith(VALID_EXTS):
+            self.coalescer.touch(path, closed=closed)
 
     def on_created(self, event):
-        if event.is_directory:
-            return
+        if not event.is_directory:
+            self._touch(event.src_path)
 
-        if not event.src_path.lower().endswith((".pdf", ".docx")):
-            return
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
 
-        if event.src_path in self.processed_files:
+    def on_closed(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path, closed=True)
+
+    def on_moved(self, event):
+        # e.g. an upload written to a temp name and renamed into place
+        if event.is_directory:
             return
+        self.coalescer.discard(event.src_path)
+        self._touch(event.dest_path)
 
-        self.processed_files.add(event.src_path)
+    def on_deleted(self, event):
+        self.coalescer.discard(event.src_path)
 
-        print(f"Processing: {event.src_path}")
-        get_response(event.src_path)
+    def on_ready(self, file_paths):
+        for file_path in file_paths:
+            if self.ledger.claim(file_path):
+                print(f"Queued: {file_path}")
+                self.enqueue(file_path)
 
     def process(self, file_path, event_type):
-        if not file_path.lower().endswith((".pdf", ".docx")):
+        if not file_path.lower().endswith(VALID_EXTS):
+            return
+        if not self.ledger.claim(file_path):
             return
         print(f"File Detected{file_path}")
-        get_response(file_path)
+        self.enqueue(file_path)
+
+    def enqueue(self, file_path):
+        """Submit an already-claimed file and record its outcome in the ledger."""
+        future = self.dispatcher.submit(file_path)
+        future.add_done_callback(lambda f: self._record(file_path, f))
+
+    def _record(self, file_path, future):
+        if future.cancelled():
+            return  # left "processing"; the next startup reconcile picks it up
+        result = future.result()
+        if result["status"] == "done":
+            self.ledger.mark_done(file_path, result["output_file"])
+        else:
+            self.ledger.mark_failed(file_path, result["error"])
 
 
 
 
-def start_watchdog():
+def start_watchdog(dispatcher=None, ledger=None):
     print("Starting Watchdog Observer")
-    event_handler = ResumeFolderHandler()
+    if dispatcher is None:
+        dispatcher = ResumeDispatcher()
+    if ledger is None:
+        ledger = FileLedger()
+    os.makedirs(INPUT_DIR, exist_ok=True)
+    event_handler = ResumeFolderHandler(dispatcher, ledger)
     observer = Observer()
     observer.schedule(event_handler, INPUT_DIR, recursive=False)
     print(f"[INFO] Watching folder: {INPUT_DIR}")
     observer.start()
+    # main() stops the coalescer before draining the dispatcher.
+    observer.coalescer = event_handler.coalescer
+    metrics.REGISTRY.gauge(
+        "resume_watch_pending_files",
+        "Files seen by the watcher that are still being written",
+        event_handler.coalescer.pending,
+    )
+
+    # Catch up on files that arrived (or were left unfinished) while we were
+    # down. The observer is already running, so nothing falls in between;
+    # candidates go through the coalescer too, in case a copy is still in
+    # progress, and the ledger stops an event and the scan from queueing
+    # the same file.
+    ledger.compact()
+    if get_status_store():
+        get_status_store().prune()
+    for file_path in ledger.reconcile(INPUT_DIR, VALID_EXTS, claim=False):
+        event_handler.coalescer.touch(file_path)
     return observer
 
 def main():
     print("Main App")
-    observer = start_watchdog()
+    dispatcher = ResumeDispatcher()
+    if METRICS_PORT:
+        metrics.serve_metrics(METRICS_PORT)
+    ledger = FileLedger()
+    observer = start_watchdog(dispatcher, ledger)
+    last_compact = time.time()
     try:
         while True:
             time.sleep(1)
+            if time.time() - last_compact > LEDGER_COMPACT_INTERVAL:
+                ledger.compact()
+                if get_status_store():
+                    get_status_store().prune()
+                last_compact = time.time()
     except KeyboardInterrupt:
         observer.stop()
 
     observer.join()
+    observer.coalescer.stop()
+    # Let files already handed to the pool finish before exiting.
+    dispatcher.shutdown(wait=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,198 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import jsonstream
+import schema
+from ratelimit import estimate_tokens
+
+# ---------------- CONFIG ----------------
+
+# Concurrent LLM-stage jobs block on a shared batch, so DISPATCH_LLM_WORKERS
+# bounds the batch size as well; raise it together with LLM_BATCH_MAX_DOCS.
+BATCH_ENABLED = os.getenv("LLM_BATCH", "0") == "1"
+# estimated resume tokens per request (the system prompt is sent once on top)
+BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "6000"))
+BATCH_MAX_DOCS = int(os.getenv("LLM_BATCH_MAX_DOCS", "8"))
+# longer resumes are not batched
+BATCH_MAX_DOC_TOKENS = int(os.getenv("LLM_BATCH_MAX_DOC_TOKENS", "1500"))
+# how long the first resume of a batch waits for others
+BATCH_WAIT_SECONDS = float(os.getenv("LLM_BATCH_WAIT_SECONDS", "0.5"))
+BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "2"))
+
+RESUME_MARKER = "=== RESUME {} ==="
+MARKER_PATTERN = re.compile(r"^[ \t]*=== RESUME (\d+) ===$", re.MULTILINE)
+
+
+class BatchSkipped(Exception):
+    """Raised to a lone resume: a plain single-document call serves it better."""
+
+
+class BatchFailed(Exception):
+    """The batch was answered but this resume's result is unusable.
+
+    Carries the shared response, the resume's token share and the call
+    seconds (or None), so the caller still records what the request cost.
+    """
+
+    def __init__(self, error, response, share, seconds):
+        super().__init__(str(error))
+        self.response, self.share, self.seconds = response, share, seconds
+
+
+def batch_instruction(count):
+    return (
+        f"The text below contains {count} separate resumes, each starting with a line "
+        f'"{RESUME_MARKER.format("N")}". Extract every resume independently and return '
+        f'ONE JSON object {{"resumes": [...]}} whose array holds exactly {count} objects '
+        "in the same order, each in the JSON format defined above:"
+    )
+
+
+def batch_content(contents):
+    return "\n\n".join(
+        f"{RESUME_MARKER.format(i)}\n{content}" for i, content in enumerate(contents, 1)
+    )
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def demux(text, contents):
+    """Split a batch completion into one validated parse_data (or exception) per resume.
+
+    The whole batch fails when the array has the wrong length. A result whose
+    non-empty name does not occur in its own resume text is rejected, which
+    catches answers returned out of order.
+    """
+    # jsonstream.loads returns the first JSON object, never a bare array
+    results = jsonstream.loads(text).get("resumes")
+    if not isinstance(results, list) or len(results) != len(contents):
+        raise ValueError(
+            f"expected {len(contents)} resumes, got "
+            f"{len(results) if isinstance(results, list) else 'no array'}"
+        )
+
+    out = []
+    for index, (item, content) in enumerate(zip(results, contents), 1):
+        try:
+            if isinstance(item, dict) and "resume" not in item:
+                item = {"resume": item}
+            parse_data = schema.validate(item)
+            name = _normalize(parse_data["resume"]["name"])
+            if name and name not in _normalize(content):
+                raise ValueError(f"name {parse_data['resume']['name']!r} not in its resume")
+            out.append(parse_data)
+        except ValueError as e:
+            out.append(ValueError(f"resume {index} of batch: {e}"))
+    return out
+
+
+class LLMBatcher:
+    """Packs short resumes from concurrent jobs into shared LLM requests.
+
+    ``extract`` blocks the calling thread (a dispatcher LLM worker) until its
+    batch has been answered. A daemon thread starts a batch when the first
+    resume arrives and sends it after ``wait`` seconds, or sooner once
+    ``max_docs`` or ``max_tokens`` is reached. Callers receive their own
+    parse_data, the shared response and their share of its tokens; on any
+    failure ``extract`` raises and the caller makes a single-document call
+    (``BatchFailed`` when the request was answered and billed).
+    """
+
+    def __init__(
+        self,
+        invoke,
+        build_messages,
+        max_tokens=BATCH_TOKEN_BUDGET,
+        max_docs=BATCH_MAX_DOCS,
+        max_doc_tokens=BATCH_MAX_DOC_TOKENS,
+        wait=BATCH_WAIT_SECONDS,
+        concurrency=BATCH_CONCURRENCY,
+    ):
+        self.invoke = invoke
+        self.build_messages = build_messages
+        self.max_tokens = max_tokens
+        self.max_docs = max_docs
+        self.max_doc_tokens = max_doc_tokens
+        self.wait = wait
+        self.batches = 0
+        self._pending = []
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llm-batch")
+        self._thread = threading.Thread(target=self._run, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+    def accepts(self, content):
+        return estimate_tokens(content) <= self.max_doc_tokens
+
+    def extract(self, content):
+        """``(parse_data, response, token share, call seconds)`` for one resume.
+
+        The request is shared, so only one resume of a batch gets the call
+        seconds; the others get None and do not record the call again.
+        """
+        item = {"content": content, "tokens": estimate_tokens(content), "future": Future()}
+        with self._cond:
+            self._pending.append(item)
+            self._cond.notify()
+        return item["future"].result()
+
+    def _full(self):
+        tokens = sum(item["tokens"] for item in self._pending)
+        return len(self._pending) >= self.max_docs or tokens >= self.max_tokens
+
+    def _take(self):
+        """Remove and return the oldest items that fit the budget (at least one)."""
+        batch, tokens = [], 0
+        while self._pending and len(batch) < self.max_docs:
+            item = self._pending[0]
+            if batch and tokens + item["tokens"] > self.max_tokens:
+                break
+            batch.append(self._pending.pop(0))
+            tokens += item["tokens"]
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.wait
+                while not self._full() and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                batch = self._take()
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch):
+        contents = [item["content"] for item in batch]
+        try:
+            if len(batch) == 1:
+                raise BatchSkipped("no other resume arrived")
+            self.batches += 1
+            print(f"[INFO] Sending {len(batch)} resumes in one LLM request")
+            started = time.perf_counter()
+            response = self.invoke(
+                self.build_messages(batch_content(contents), batch_instruction(len(batch)))
+            )
+            seconds = time.perf_counter() - started
+        except Exception as e:
+            for item in batch:
+                item["future"].set_exception(e)
+            return
+
+        try:
+            results = demux(response.content, contents)
+        except Exception as e:
+            results = [e] * len(batch)
+        total = sum(item["tokens"] for item in batch)
+        for item, result in zip(batch, results):
+            share = item["tokens"] / total
+            if isinstance(result, Exception):
+                item["future"].set_exception(BatchFailed(result, response, share, seconds))
+            else:
+                item["future"].set_result((result, response, share, seconds))
+            seconds = None
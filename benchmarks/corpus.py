@@ -0,0 +1,138 @@
+"""Synthetic resume corpus for the benchmarks.
+
+Every document is derived from the ``state`` fixture in main.py, so the same
+arguments always produce the same files. ``pages`` is the target length of
+the source document (filled with experience entries; a large skill table can
+push it over) and ``skills`` the number of skills in the skillset table.
+"""
+
+import copy
+import datetime
+import os
+
+PAGE_COUNTS = (1, 2, 4)
+SKILL_COUNTS = (8, 32, 96)
+FORMATS = ("pdf", "docx")
+
+DOMAINS = ("Backend", "Cloud", "DevOps", "Data", "AI / ML", "Tools")
+CATEGORIES = ("Frameworks", "Platforms", "Libraries", "Services")
+SKILLS_PER_CATEGORY = 4
+# Lines that fit on one page of the source PDF written by write_pdf
+LINES_PER_PAGE = 55
+
+
+def case_name(fmt, pages, skills):
+    return f"{fmt}-p{pages}-s{skills}"
+
+
+def make_parse_data(pages, skills):
+    """parse_data shaped like the LLM output, sized by pages and skill count."""
+    from main import state
+
+    document = copy.deepcopy(state)
+    resume = document["resume"]
+    resume["name"] = f"Benchmark Candidate P{pages} S{skills}"
+    sections = resume["sections"]
+
+    skillset = {}
+    for i in range(skills):
+        group = i // SKILLS_PER_CATEGORY
+        domain = DOMAINS[group % len(DOMAINS)]
+        category = f"{CATEGORIES[group % len(CATEGORIES)]} {group}"
+        skillset.setdefault(domain, {}).setdefault(category, []).append(f"Skill {i}")
+    sections["Skillset"] = skillset
+
+    # Add history entries until the source document fills ``pages`` pages.
+    template = sections["Professional History"]
+    history = sections["Professional History"] = []
+    while not history or len(resume_lines(document)) < pages * LINES_PER_PAGE - 10:
+        i = len(history)
+        history.append(
+            {
+                **template[i % len(template)],
+                "company": f"Company {i}",
+                "timespan": f"Jan {2010 + i} - Dec {2010 + i}",
+            }
+        )
+    return document
+
+
+def resume_lines(parse_data):
+    """Plain-text lines of a source resume for ``parse_data``."""
+    resume = parse_data["resume"]
+    sections = resume["sections"]
+    contact = resume["contact"]
+
+    lines = [resume["name"], " | ".join(contact.values()), "", "SUMMARY"]
+    lines += resume["summary"]
+    lines += ["", "EXPERIENCE"]
+    for job in sections["Professional History"]:
+        lines.append(f"{job['title']} - {job['company']} ({job['timespan']})")
+        lines += [f"- {point}" for point in job["points"]]
+        lines += [f"- {point}" for point in sections["Career Summary"]]
+    lines += ["", "SKILLS"]
+    for domain, categories in sections["Skillset"].items():
+        for category, values in categories.items():
+            lines.append(f"{domain} / {category}: {', '.join(values)}")
+    lines += ["", "PROJECTS"]
+    for project in sections["Project Showcase"]:
+        lines.append(f"{project['title']} ({', '.join(project['technologies'])})")
+        lines += [f"- {point}" for point in project["points"]]
+    lines += ["", "EDUCATION"] + sections["Education"]
+    return lines
+
+
+def write_pdf(path, parse_data):
+    from reportlab import rl_config
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    previous, rl_config.invariant = rl_config.invariant, 1  # byte-stable output
+    try:
+        c = canvas.Canvas(path, pagesize=A4)
+        width, height = A4
+        y = height - 60
+        for line in resume_lines(parse_data):
+            if y < 60:
+                c.showPage()
+                y = height - 60
+            c.setFont("Helvetica", 9)
+            c.drawString(50, y, line[:110])
+            y -= 13
+        c.save()
+    finally:
+        rl_config.invariant = previous
+
+
+def write_docx(path, parse_data):
+    from docx import Document
+
+    doc = Document()
+    for line in resume_lines(parse_data):
+        doc.add_paragraph(line)
+    doc.core_properties.created = datetime.datetime(2000, 1, 1)  # stable metadata
+    doc.save(path)
+
+
+def build_corpus(directory, page_counts=PAGE_COUNTS, skill_counts=SKILL_COUNTS, formats=FORMATS):
+    """Write the corpus to ``directory`` and return one dict per document."""
+    os.makedirs(directory, exist_ok=True)
+    cases = []
+    for fmt in formats:
+        for pages in page_counts:
+            for skills in skill_counts:
+                name = case_name(fmt, pages, skills)
+                parse_data = make_parse_data(pages, skills)
+                path = os.path.join(directory, f"{name}.{fmt}")
+                (write_pdf if fmt == "pdf" else write_docx)(path, parse_data)
+                cases.append(
+                    {
+                        "name": name,
+                        "path": path,
+                        "format": fmt,
+                        "pages": pages,
+                        "skills": skills,
+                        "parse_data": parse_data,
+                    }
+                )
+    return cases
@@ -0,0 +1,323 @@
+"""Benchmarks for the extraction, LLM-stub and rendering stages.
+
+Run from the repository root::
+
+    python -m benchmarks.harness                  # compare with benchmarks/baseline.json
+    python -m benchmarks.harness --save-baseline  # record a new baseline
+    python cli.py bench --only generate_resume_pdf --repeat 20
+
+Each benchmark runs once per corpus document. ``p50``/``p95`` are per-call
+latencies over ``repeat`` timed runs (after one warm-up), ``peak_kb`` is the
+tracemalloc peak of one extra run and ``ops_per_sec`` is calls per second
+(PDFs/sec for the render benchmarks). ``import_time`` times cold imports of
+the entry modules in fresh interpreters.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+# p50 slowdown (fraction) reported as a regression
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.15"))
+
+
+# ---------------- MEASUREMENT ----------------
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the pipeline's progress prints and INFO logs while timing."""
+    render_logger = logging.getLogger("resume_pdf_generator")
+    level = render_logger.level
+    render_logger.setLevel(logging.WARNING)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        render_logger.setLevel(level)
+
+
+def measure(fn, arg, repeat):
+    with quiet():
+        fn(arg)  # warm-up: imports, fonts, image cache
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(arg)
+            samples.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            fn(arg)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        "n": len(samples),
+        "p50": round(percentile(samples, 50), 6),
+        "p95": round(percentile(samples, 95), 6),
+        "mean": round(total / len(samples), 6),
+        "peak_kb": round(peak / 1024, 1),
+        "ops_per_sec": round(len(samples) / total, 2) if total else 0.0,
+    }
+
+
+# ---------------- BENCHMARKS ----------------
+#
+# Each takes a corpus case and returns the callable to time.
+
+
+def bench_get_content(case):
+    import agent
+
+    return lambda c: agent.get_content({"file_path": c["path"]})
+
+
+def bench_get_content_markdown(case):
+    import agent
+
+    return lambda c: agent.get_content_markdown({"file_path": c["path"]})
+
+
+def bench_llm_stub(case):
+    import agent
+
+    content = agent.get_content_markdown({"file_path": case["path"]})["content"]
+    return lambda c: agent.get_content_strutured({"content": content})
+
+
+def bench_compact(case):
+    import agent
+    import compaction
+    from ratelimit import estimate_tokens
+
+    content = agent.get_content_markdown({"file_path": case["path"]})["content"]
+    # Over budget, with back-to-back headings (sections with no body), so the
+    # trimming path runs on every document.
+    content = "EDUCATION\nEXPERIENCE\n" + content
+    budget = estimate_tokens(content) // 4
+    return lambda c: compaction.compact(content, budget=budget)
+
+
+def bench_generate_resume_pdf(case):
+    from main import generate_resume_pdf
+
+    return lambda c: generate_resume_pdf(c["parse_data"], output_file=io.BytesIO())
+
+
+def bench_draw_skillset_table(case):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    from main import PAGE_HEIGHT, RenderContext, draw_skillset_table
+
+    resume = case["parse_data"]["resume"]
+
+    def draw(c):
+        ctx = RenderContext(canvas.Canvas(io.BytesIO(), pagesize=A4), resume["name"], resume["contact"])
+        draw_skillset_table(ctx, resume["sections"]["Skillset"], PAGE_HEIGHT - 150)
+
+    return draw
+
+
+def bench_pipeline(case):
+    import agent
+
+    output_dir = tempfile.mkdtemp(prefix="bench-")
+
+    def run(c):
+        state = {"file_path": c["path"], "output_file": os.path.join(output_dir, c["name"] + ".pdf")}
+        for node in (agent.get_content_markdown, agent.get_content_strutured, agent.generate_PDF):
+            state = node(state)
+        return state
+
+    return run
+
+
+BENCHMARKS = {
+    "get_content": bench_get_content,
+    "get_content_markdown": bench_get_content_markdown,
+    "llm_stub": bench_llm_stub,
+    "compact": bench_compact,
+    "generate_resume_pdf": bench_generate_resume_pdf,
+    "draw_skillset_table": bench_draw_skillset_table,
+    "pipeline": bench_pipeline,
+}
+# Render-only benchmarks do not depend on the source format.
+FORMAT_INDEPENDENT = {"generate_resume_pdf", "draw_skillset_table"}
+# Not per document: cold imports in fresh interpreters (benchmarks/import_time.py).
+IMPORT_TIME = "import_time"
+
+
+def run_benchmarks(
+    names=None, repeat=REPEAT, quick=False, corpus_dir=CORPUS_DIR, stub_latency=0.0, stub_cache_discount=0.5
+):
+    import cache
+    from benchmarks.corpus import build_corpus
+    from benchmarks.stub_llm import StubLLM, install
+
+    cache.CACHE_ENABLED = False  # every run must do the real work
+    if quick:
+        cases = build_corpus(corpus_dir, page_counts=(1,), skill_counts=(8, 96))
+    else:
+        cases = build_corpus(corpus_dir)
+    install(
+        StubLLM([c["parse_data"] for c in cases], latency=stub_latency, cache_discount=stub_cache_discount)
+    )
+
+    names = list(names or [*BENCHMARKS, IMPORT_TIME])
+    results = {}
+    if IMPORT_TIME in names:
+        from benchmarks.import_time import measure_imports
+
+        names.remove(IMPORT_TIME)
+        results.update(measure_imports(repeat=repeat))
+
+    for name in names:
+        factory = BENCHMARKS[name]
+        for case in cases:
+            if name in FORMAT_INDEPENDENT and case["format"] != "pdf":
+                continue
+            key = f"{name}/{case['name'][4:] if name in FORMAT_INDEPENDENT else case['name']}"
+            with quiet():
+                fn = factory(case)
+            results[key] = measure(fn, case, repeat)
+            print(f"[INFO] {key}: p50={results[key]['p50'] * 1000:.1f}ms")
+    return results
+
+
+# ---------------- BASELINE ----------------
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+    print(f"[INFO] Baseline written to {path}")
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print a comparison table; returns the keys whose p50 regressed."""
+    previous = baseline["results"]
+    if baseline.get("environment") != environment():
+        print("[WARN] Baseline was recorded on a different environment; compare with care")
+
+    regressions = []
+    print(f"{'benchmark':<44} {'p50 ms':>9} {'base ms':>9} {'delta':>8} {'p95 ms':>9} {'peak KB':>9} {'ops/s':>8}")
+    for key, stats in results.items():
+        base = previous.get(key)
+        delta = ""
+        if base and base["p50"]:
+            change = stats["p50"] / base["p50"] - 1
+            delta = f"{change:+.0%}"
+            if change > tolerance:
+                regressions.append(key)
+                delta += " !"
+        print(
+            f"{key:<44} {stats['p50'] * 1000:>9.2f} "
+            f"{(base['p50'] * 1000 if base else float('nan')):>9.2f} {delta:>8} "
+            f"{stats['p95'] * 1000:>9.2f} {stats['peak_kb']:>9.1f} {stats['ops_per_sec']:>8.2f}"
+        )
+    return regressions
+
+
+def summarize(results):
+    """PDFs/sec over the whole corpus for the render and pipeline benchmarks."""
+    for name in ("generate_resume_pdf", "pipeline"):
+        rows = [s for k, s in results.items() if k.startswith(name + "/")]
+        if rows:
+            seconds = sum(s["mean"] for s in rows)
+            print(f"[INFO] {name}: {len(rows) / seconds:.2f} PDFs/sec across {len(rows)} corpus documents")
+
+
+# ---------------- ENTRY ----------------
+
+
+def add_arguments(parser):
+    parser.add_argument("--only", nargs="+", choices=sorted([*BENCHMARKS, IMPORT_TIME]), help="Benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Timed runs per document")
+    parser.add_argument("--quick", action="store_true", help="Small corpus (1 page, 8/96 skills)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds added to each stub LLM call")
+    parser.add_argument(
+        "--stub-cache-discount",
+        type=float,
+        default=0.5,
+        help="Fraction of --stub-latency saved when the stub's simulated prompt cache hits (0 disables)",
+    )
+    parser.add_argument("--output", help="Also write the results JSON here")
+
+
+def run(args):
+    results = run_benchmarks(
+        args.only,
+        args.repeat,
+        args.quick,
+        stub_latency=args.stub_latency,
+        stub_cache_discount=args.stub_cache_discount,
+    )
+    summarize(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"[WARN] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    regressions = compare(results, baseline)
+    if regressions:
+        print(f"[ERROR] {len(regressions)} benchmark(s) slower than baseline by more than {TOLERANCE:.0%}")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Import-time benchmark: cost of a cold ``import <module>`` in a fresh interpreter.
+
+    python -m benchmarks.import_time                # default modules
+    python -m benchmarks.import_time agent --top 15 # plus the slowest imports
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("agent", "automate", "dispatcher", "extractor", "main", "api")
+
+_PROBE = (
+    "import time; t = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _env():
+    # agent.py must import without credentials; a dummy key keeps older trees comparable.
+    return {**os.environ, "GROQ_API_KEY": os.getenv("GROQ_API_KEY", "bench")}
+
+
+def import_seconds(module):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        cwd=REPO_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_imports(modules=MODULES, repeat=5):
+    """Stats per module in the same shape as the harness results."""
+    from benchmarks.harness import percentile
+
+    results = {}
+    for module in modules:
+        samples = [import_seconds(module) for _ in range(repeat)]
+        total = sum(samples)
+        results[f"import_time/{module}"] = {
+            "n": repeat,
+            "p50": round(percentile(samples, 50), 6),
+            "p95": round(percentile(samples, 95), 6),
+            "mean": round(total / repeat, 6),
+            "peak_kb": 0.0,
+            "ops_per_sec": round(repeat / total, 2) if total else 0.0,
+        }
+        print(f"[INFO] import {module}: p50={results[f'import_time/{module}']['p50'] * 1000:.0f}ms")
+    return results
+
+
+def slowest_imports(module, top=10):
+    """``(cumulative_us, name)`` for the slowest imports under ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports per module")
+    args = parser.parse_args(argv)
+
+    measure_imports(args.modules, args.repeat)
+    for module in args.modules if args.top else ():
+        print(f"[INFO] slowest imports under {module}:")
+        for cumulative, name in slowest_imports(module, args.top):
+            print(f"    {cumulative / 1000:8.1f}ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Deterministic stand-in for the Groq client used by agent.py."""
+
+import hashlib
+import json
+import time
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# characters per streamed chunk
+CHUNK_SIZE = 64
+
+
+class StubLLM:
+    """Answers with pre-registered parse_data instead of calling a provider.
+
+    The response for a prompt is the registered document whose candidate name
+    appears in it, or the ``state`` fixture from main.py; a batched prompt
+    (batching.py) gets ``{"resumes": [...]}`` with one document per resume.
+    ``latency`` adds a fixed delay per call to model network time.
+
+    Provider prefix caching is simulated: once a system message has been
+    seen, later calls report its tokens as ``cache_read`` and their latency
+    is cut by ``cache_discount`` (a fraction, 0 disables the simulation).
+    """
+
+    def __init__(self, documents=(), latency=0.0, cache_discount=0.5):
+        self.documents = {d["resume"]["name"]: d for d in documents}
+        self.latency = latency
+        self.cache_discount = cache_discount
+        self.calls = 0
+        self.cache_hits = 0
+        self._prefixes = set()
+
+    def _document(self, text):
+        for name, document in self.documents.items():
+            if name in text:
+                return document
+        from main import state
+
+        return state
+
+    def _cached_tokens(self, messages):
+        """Tokens of the system message when it is already "cached"."""
+        if not self.cache_discount or not messages:
+            return 0
+        prefix = messages[0].content
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        if key not in self._prefixes:
+            self._prefixes.add(key)
+            return 0
+        self.cache_hits += 1
+        return len(prefix) // 4
+
+    def invoke(self, messages):
+        self.calls += 1
+        prompt = "".join(m.content for m in messages)
+        cached = self._cached_tokens(messages)
+        if self.latency:
+            time.sleep(self.latency * (1 - self.cache_discount) if cached else self.latency)
+        from batching import MARKER_PATTERN
+
+        parts = MARKER_PATTERN.split(prompt)
+        if len(parts) > 1:  # [preamble, "1", text, "2", text, ...]
+            content = json.dumps({"resumes": [self._document(text) for text in parts[2::2]]})
+        else:
+            content = json.dumps(self._document(prompt))
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+                "input_token_details": {"cache_read": cached},
+            },
+        )
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+    def stream(self, messages):
+        """The ``invoke`` answer in CHUNK_SIZE pieces; usage rides on the last one."""
+        response = self.invoke(messages)
+        content = response.content
+        for start in range(0, len(content), CHUNK_SIZE):
+            last = start + CHUNK_SIZE >= len(content)
+            yield AIMessageChunk(
+                content=content[start : start + CHUNK_SIZE],
+                usage_metadata=response.usage_metadata if last else None,
+            )
+
+    async def astream(self, messages):
+        for chunk in self.stream(messages):
+            yield chunk
+
+
+def install(stub):
+    """Route agent.py's LLM calls to ``stub``; returns the previous client."""
+    import agent
+
+    return agent.set_llm(stub)
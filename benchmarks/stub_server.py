@@ -0,0 +1,290 @@
+"""Local OpenAI/Groq-compatible LLM server for offline load tests.
+
+Run from the repository root and point the pipeline at it::
+
+    python -m benchmarks.stub_server --latency 0.8 --error-rate 0.02 --rate-limit-rate 0.05
+    LLM_BACKEND=stub python automate.py
+
+It serves ``POST /openai/v1/chat/completions`` (the Groq client's path) and
+``POST /v1/chat/completions`` (OpenAI clients), streaming or not. Answers are
+templated by default: the ``state`` fixture from main.py with the name,
+email and phone taken from the resume text, so batched prompts (one
+``{"resumes": [...]}`` answer) pass the name check in batching.demux.
+``--response FILE`` returns that JSON document for every resume instead.
+
+Each request waits ``--latency`` (plus up to ``--jitter``) seconds, less
+``--cache-discount`` when its system prompt has been seen before (reported
+as cached prompt tokens), and streams output at ``--tokens-per-second``.
+``--error-rate`` and ``--rate-limit-rate`` fail that fraction of requests
+with a 500 or a 429 carrying Retry-After. ``GET /stats`` returns counters.
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+CHUNK_SIZE = 64
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+
+
+def _tokens(text):
+    return len(text) // 4
+
+
+def template_document(text, template):
+    """``template`` with the name, email and phone found in ``text``."""
+    document = copy.deepcopy(template)
+    resume = document["resume"]
+    for line in text.splitlines():
+        name = line.strip("#*_ \t")
+        if name:
+            if len(name) <= 60:
+                resume["name"] = name
+            break
+    contact = resume.setdefault("contact", {})
+    email = EMAIL.search(text)
+    phone = PHONE.search(text)
+    contact["email"] = email.group(0).lower() if email else "None"
+    contact["phone"] = phone.group(0) if phone else "None"
+    return document
+
+
+class StubServer:
+    """Builds answers and applies the configured latency and failures."""
+
+    def __init__(
+        self,
+        latency=0.5,
+        jitter=0.0,
+        tokens_per_second=0.0,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        retry_after=1.0,
+        cache_discount=0.5,
+        response=None,
+        seed=None,
+    ):
+        from main import state
+
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.cache_discount = cache_discount
+        self.response = response
+        self.template = state
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "cache_hits": 0, "in_flight": 0}
+        self._prefixes = set()
+        self._lock = threading.Lock()
+
+    def failure(self):
+        """``(status code, headers)`` for an injected failure, or None."""
+        roll = self.random.random()
+        with self._lock:
+            self.stats["requests"] += 1
+            if roll < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return 429, {"retry-after": str(self.retry_after)}
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return 500, {}
+        return None
+
+    def cached_tokens(self, messages):
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = messages[0].get("content") or ""
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key not in self._prefixes:
+                self._prefixes.add(key)
+                return 0
+            self.stats["cache_hits"] += 1
+        return _tokens(prefix)
+
+    def delay(self, cached):
+        seconds = self.latency + self.jitter * self.random.random()
+        return seconds * (1 - self.cache_discount) if cached else seconds
+
+    def answer(self, messages):
+        from batching import MARKER_PATTERN
+
+        human = "\n".join(m.get("content") or "" for m in messages if m.get("role") == "user")
+        _, _, text = human.partition("\n\n")  # drop the instruction line
+        parts = MARKER_PATTERN.split(human)
+        if len(parts) > 1:  # [preamble, "1", text, "2", text, ...]
+            return json.dumps({"resumes": [self.document(part) for part in parts[2::2]]})
+        return json.dumps(self.document(text or human))
+
+    def document(self, text):
+        if self.response is not None:
+            return self.response
+        return template_document(text, self.template)
+
+    def usage(self, messages, content, cached):
+        prompt = sum(_tokens(m.get("content") or "") for m in messages)
+        completion = _tokens(content)
+        return {
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "total_tokens": prompt + completion,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+
+def create_app(server):
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+
+    app = FastAPI(title="Resume LLM stub")
+
+    async def completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        model = body.get("model", "stub")
+        failure = server.failure()
+        if failure:
+            status, headers = failure
+            message = "Rate limit reached (stub)" if status == 429 else "Internal error (stub)"
+            return JSONResponse(
+                {"error": {"message": message, "type": "stub_error", "code": status}},
+                status_code=status,
+                headers=headers,
+            )
+
+        cached = server.cached_tokens(messages)
+        server.stats["in_flight"] += 1
+        streaming = False
+        try:
+            await asyncio.sleep(server.delay(cached))
+            content = server.answer(messages)
+            usage = server.usage(messages, content, cached)
+            if body.get("stream"):
+                streaming = True  # the stream decrements in_flight when it ends
+                return StreamingResponse(
+                    events(content, usage, model), media_type="text/event-stream"
+                )
+        finally:
+            if not streaming:
+                server.stats["in_flight"] -= 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    async def events(content, usage, model):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        def chunk(delta, finish_reason=None, **extra):
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        try:
+            pause = CHUNK_SIZE / 4 / server.tokens_per_second if server.tokens_per_second else 0
+            yield chunk({"role": "assistant", "content": ""})
+            for start in range(0, len(content), CHUNK_SIZE):
+                if pause:
+                    await asyncio.sleep(pause)
+                yield chunk({"content": content[start : start + CHUNK_SIZE]})
+            # Groq reports usage in x_groq, OpenAI in usage
+            yield chunk({}, "stop", usage=usage, x_groq={"id": completion_id, "usage": usage})
+            yield "data: [DONE]\n\n"
+        finally:
+            server.stats["in_flight"] -= 1
+
+    app.post("/openai/v1/chat/completions")(completions)
+    app.post("/v1/chat/completions")(completions)
+
+    @app.get("/stats")
+    def stats():
+        return server.stats
+
+    return app
+
+
+# ---------------- ENTRY ----------------
+
+
+def add_arguments(parser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before each answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random seconds, up to this much")
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=0.0, help="Streaming output rate (0 sends at once)"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction of requests failing with 429"
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument(
+        "--cache-discount",
+        type=float,
+        default=0.5,
+        help="Fraction of the latency saved when the system prompt was seen before (0 disables)",
+    )
+    parser.add_argument("--response", help="JSON file returned for every resume instead of the template")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and failure injection")
+
+
+def run(args):
+    import uvicorn
+
+    response = None
+    if args.response:
+        with open(args.response, encoding="utf-8") as f:
+            response = json.load(f)
+    server = StubServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        cache_discount=args.cache_discount,
+        response=response,
+        seed=args.seed,
+    )
+    print(f"[INFO] LLM stub listening on http://{args.host}:{args.port} (LLM_BACKEND=stub)")
+    uvicorn.run(create_app(server), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
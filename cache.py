@@ -0,0 +1,240 @@
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import metrics
+
+# ---------------- CONFIG ----------------
+
+CACHE_DIR = os.getenv("CACHE_DIR", "CacheFolder")
+CACHE_DB = os.path.join(CACHE_DIR, "results.db")
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") != "0"
+# seconds between writes of buffered hit/miss counts and LRU touches
+CACHE_FLUSH_INTERVAL = float(os.getenv("CACHE_FLUSH_INTERVAL", "5"))
+
+# kinds of entries stored per input file
+MARKDOWN = "markdown"
+PARSE_DATA = "parse_data"
+PDF_PATH = "pdf_path"
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def cache_key(*parts):
+    return ":".join(str(p) for p in parts)
+
+
+class ResultCache:
+    """Content-addressed cache of pipeline results, persisted in SQLite.
+
+    Entries are keyed by ``(kind, key)`` where ``key`` starts with the input
+    file's content hash, so renamed copies and re-uploads hit the same entry.
+    When the stored bytes exceed ``max_bytes`` the least recently used
+    entries are evicted. Hit/miss counters are kept per kind in the same db;
+    lookups buffer them (and the LRU touch) in memory and write them every
+    ``CACHE_FLUSH_INTERVAL`` seconds, so a read does not commit.
+    """
+
+    def __init__(self, path=CACHE_DB, max_bytes=CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counts = {}  # kind -> [hits, misses] not yet written
+        self._touched = {}  # (kind, key) -> last access not yet written
+        self._flushed_at = time.monotonic()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)"
+        )
+        # Counters live in the db so hits from worker processes add up.
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS counters (
+                kind TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, kind, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            counts = self._counts.setdefault(kind, [0, 0])
+            counts[1 if row is None else 0] += 1
+            if row is not None:
+                self._touched[(kind, key)] = time.time()
+            if time.monotonic() - self._flushed_at >= CACHE_FLUSH_INTERVAL:
+                self._flush()
+                self._conn.commit()
+            return None if row is None else row[0]
+
+    def flush(self):
+        """Write buffered hit/miss counts and LRU touches to the db."""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+
+    def _flush(self):
+        for kind, (hits, misses) in self._counts.items():
+            self._conn.execute(
+                "INSERT INTO counters (kind, hits, misses) VALUES (?, ?, ?) "
+                "ON CONFLICT(kind) DO UPDATE SET hits = hits + excluded.hits, "
+                "misses = misses + excluded.misses",
+                (kind, hits, misses),
+            )
+        # MAX keeps a newer put (or another process's touch) from moving back.
+        self._conn.executemany(
+            "UPDATE entries SET last_access = MAX(last_access, ?) WHERE kind = ? AND key = ?",
+            [(at, kind, key) for (kind, key), at in self._touched.items()],
+        )
+        self._counts.clear()
+        self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def put(self, kind, key, value):
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (kind, key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, key, value, size, time.time()),
+            )
+            self._flush()  # eviction needs the buffered LRU touches
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, kind, key):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            )
+            self._conn.commit()
+
+    def iter_entries(self, kind, batch_size=500):
+        """Yield ``(key, value)`` for every entry of ``kind``, without touching LRU order.
+
+        Rows are read in key order a batch at a time, so the lock is never
+        held while the caller works through them.
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM entries WHERE kind = ? AND key > ? "
+                    "ORDER BY key LIMIT ?",
+                    (kind, last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT kind, key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        evicted = 0
+        for kind, key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key)
+            )
+            total -= size
+            evicted += 1
+        print(f"[CACHE] Evicted {evicted} entries, {total} bytes remain")
+
+    def stats(self):
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = self._conn.execute(
+                "SELECT kind, hits, misses FROM counters ORDER BY kind"
+            ).fetchall()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": {kind: hits for kind, hits, _ in counters},
+            "misses": {kind: misses for kind, _, misses in counters},
+            "hit_ratio": {
+                kind: round(hits / ((hits + misses) or 1), 3)
+                for kind, hits, misses in counters
+            },
+        }
+
+
+_CACHE = None
+_CACHE_PID = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache instance, or None when CACHE_ENABLED=0.
+
+    Forked workers (dispatcher process pools) get their own connection
+    instead of sharing the parent's.
+    """
+    global _CACHE, _CACHE_PID
+    if not CACHE_ENABLED:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE_PID != os.getpid():
+            _CACHE = ResultCache()
+            _CACHE_PID = os.getpid()
+            atexit.register(_CACHE.flush)
+            _register_metrics(_CACHE)
+        return _CACHE
+
+
+def _register_metrics(result_cache):
+    """Hit/miss gauges per kind; the counts are shared by every process using the db."""
+    metrics.REGISTRY.gauge(
+        "resume_cache_hits",
+        "Result cache hits by kind",
+        lambda: result_cache.stats()["hits"],
+        label="kind",
+    )
+    metrics.REGISTRY.gauge(
+        "resume_cache_misses",
+        "Result cache misses by kind",
+        lambda: result_cache.stats()["misses"],
+        label="kind",
+    )
@@ -0,0 +1,342 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+
+from cache import file_hash
+
+VALID_EXTS = (".pdf", ".docx")
+
+
+# ---------------- PROGRESS ----------------
+
+
+class Progress:
+    """Single-line progress bar on stderr."""
+
+    def __init__(self, total, width=30):
+        self.total = total
+        self.width = width
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, status):
+        with self._lock:
+            if status == "done":
+                self.done += 1
+            elif status == "skipped":
+                self.skipped += 1
+            else:
+                self.failed += 1
+            self.draw()
+
+    def draw(self):
+        finished = self.done + self.failed + self.skipped
+        elapsed = time.perf_counter() - self.started
+        rate = (self.done + self.failed) / elapsed if elapsed else 0.0
+        remaining = self.total - finished
+        eta = f"{remaining / rate:.0f}s" if rate else "?"
+        filled = int(self.width * finished / self.total) if self.total else self.width
+        bar = "#" * filled + "." * (self.width - filled)
+        sys.stderr.write(
+            f"\r[{bar}] {finished}/{self.total} done={self.done} failed={self.failed} "
+            f"skipped={self.skipped} {rate:.2f} files/s ETA {eta} "
+        )
+        sys.stderr.flush()
+
+    def close(self):
+        self.draw()
+        sys.stderr.write("\n")
+
+
+# ---------------- MANIFEST ----------------
+
+
+def load_manifest(path):
+    """Content hashes already converted successfully in a previous run."""
+    finished = set()
+    if not os.path.exists(path):
+        return finished
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from a crash
+            if record.get("status") == "done":
+                finished.add(record.get("file_hash"))
+    return finished
+
+
+class ManifestWriter:
+    def __init__(self, path):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+# ---------------- SOURCES ----------------
+
+
+def iter_directory(source):
+    for root, _, files in os.walk(source):
+        for name in sorted(files):
+            if name.lower().endswith(VALID_EXTS):
+                yield os.path.join(root, name)
+
+
+def _safe_member(name):
+    """False for names ``ZipFile.extract`` would rewrite (absolute, ``..``, ``.``)."""
+    parts = name.split("/")
+    return not os.path.isabs(name) and all(part not in ("", ".", "..") for part in parts)
+
+
+def list_archive(source):
+    """``(members, unsafe)``: resume members to convert and names with unsafe paths."""
+    members, unsafe = [], []
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(VALID_EXTS):
+                continue
+            if not _safe_member(info.filename):
+                print(f"[WARN] Skipping archive member with an unsafe path: {info.filename}")
+                unsafe.append(info.filename)
+                continue
+            members.append(info)
+    return members, unsafe
+
+
+def iter_archive(source, members, staging_dir, on_skip=None):
+    """Extract members one at a time so large archives are never unpacked up front.
+
+    ``on_skip(name, reason)`` is called for a member that cannot be used.
+    """
+    with zipfile.ZipFile(source) as archive:
+        for info in members:
+            target = os.path.join(staging_dir, info.filename)
+            if not (os.path.exists(target) and os.path.getsize(target) == info.file_size):
+                extracted = archive.extract(info, staging_dir)
+                if os.path.normpath(extracted) != os.path.normpath(target):
+                    # extract() sanitized the name (e.g. characters invalid on Windows)
+                    print(f"[WARN] Skipping {info.filename}: extracted as {extracted}")
+                    if on_skip:
+                        on_skip(info.filename, f"extracted as {extracted}")
+                    continue
+            yield target
+
+
+# ---------------- BATCH ----------------
+
+
+def run_batch(args):
+    from dispatcher import ResumeDispatcher
+
+    source = args.source
+    manifest_path = args.manifest or (
+        os.path.splitext(source.rstrip(os.sep))[0] + ".manifest.jsonl"
+    )
+
+    members, unsafe = None, []
+    if zipfile.is_zipfile(source):
+        members, unsafe = list_archive(source)
+        staging_dir = os.path.splitext(manifest_path)[0] + "_files"
+        os.makedirs(staging_dir, exist_ok=True)
+        total = len(members) + len(unsafe)
+    elif os.path.isdir(source):
+        files = list(iter_directory(source))
+        total = len(files)
+    else:
+        print(f"[ERROR] {source} is neither a directory nor a zip archive")
+        return 2
+
+    finished = load_manifest(manifest_path)
+    print(f"[INFO] {total} file(s) in {source}, {len(finished)} already converted")
+    print(f"[INFO] Writing manifest to {manifest_path}")
+
+    dispatcher = ResumeDispatcher(
+        queue_size=args.queue_size,
+        parse_workers=args.parse_workers,
+        llm_workers=args.workers,
+        render_workers=args.render_workers,
+    )
+    manifest = ManifestWriter(manifest_path)
+    progress = Progress(total)
+
+    def write(path, digest, status, error, output_file=None, timings=None):
+        manifest.write(
+            {
+                "source": path,
+                "file_hash": digest,
+                "status": status,
+                "error": error,
+                "output_file": output_file,
+                "timings": timings or {},
+                "finished_at": time.time(),
+            }
+        )
+        progress.update(status)
+
+    def record(path, digest, future):
+        result = future.result()
+        write(
+            path,
+            digest,
+            result["status"],
+            result["error"],
+            result["output_file"],
+            result["timings"],
+        )
+
+    def skip(name, reason):
+        write(name, None, "skipped", reason)
+
+    if members is not None:
+        files = iter_archive(source, members, staging_dir, on_skip=skip)
+
+    try:
+        for name in unsafe:
+            skip(name, "unsafe path in archive")
+        for path in files:
+            try:
+                digest = file_hash(path)
+            except OSError as e:
+                print(f"[ERROR] Cannot read {path}: {e}")
+                write(path, None, "failed", f"read: {e}")
+                continue
+            if digest in finished:
+                progress.update("skipped")
+                continue
+            finished.add(digest)  # duplicate copies inside one batch run once
+            future = dispatcher.submit(path)  # blocks while the queue is full
+            future.add_done_callback(
+                lambda f, p=path, d=digest: record(p, d, f)
+            )
+    except KeyboardInterrupt:
+        print("\n[WARN] Interrupted, finishing in-flight files")
+        dispatcher.shutdown(wait=True, cancel_pending=True)
+    finally:
+        # drains in-flight files before the manifest their callbacks write to closes
+        dispatcher.shutdown(wait=True)
+        progress.close()
+        manifest.close()
+
+    print(
+        f"[INFO] Batch finished: {progress.done} converted, {progress.failed} failed, "
+        f"{progress.skipped} skipped"
+    )
+    return 1 if progress.failed else 0
+
+
+def run_render(args):
+    from render_batch import run_render as render
+
+    return render(args)
+
+
+def run_stress(args):
+    from render_batch import run_stress as stress
+
+    return stress(args)
+
+
+def _forward(args, add_arguments, run):
+    """Parse a subcommand's remaining arguments with its module's own options."""
+    parser = argparse.ArgumentParser(prog=f"resumestandard {args.command}")
+    add_arguments(parser)
+    return run(parser.parse_args(args.rest))
+
+
+# The benchmark modules are imported only when their subcommand runs.
+
+
+def run_bench(args):
+    from benchmarks.harness import add_arguments, run as bench
+
+    return _forward(args, add_arguments, bench)
+
+
+def run_stub_server(args):
+    from benchmarks.stub_server import add_arguments, run as stub_server
+
+    return _forward(args, add_arguments, stub_server)
+
+
+# ---------------- ENTRY ----------------
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="resumestandard", description="Resume standardization tools"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="Convert every resume in a directory or zip archive"
+    )
+    batch.add_argument("source", help="Directory or .zip of .pdf/.docx resumes")
+    batch.add_argument("--manifest", help="JSONL manifest path (default: <source>.manifest.jsonl)")
+    batch.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls")
+    batch.add_argument("--parse-workers", type=int, default=os.cpu_count() or 2)
+    batch.add_argument("--render-workers", type=int, default=os.cpu_count() or 2)
+    batch.add_argument("--queue-size", type=int, default=64)
+    batch.set_defaults(func=run_batch)
+
+    render = commands.add_parser(
+        "render", help="Re-render PDFs from extracted parse_data JSON, skipping the LLM"
+    )
+    render.add_argument("source", nargs="?", help="Directory of .json files or a .jsonl file")
+    render.add_argument("--from-cache", action="store_true", help="Render every cached parse_data")
+    render.add_argument("--output", default="OutputFolder", help="Directory for rendered PDFs")
+    render.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    render.add_argument("--no-contact", action="store_true", help="Hide the contact block")
+    render.set_defaults(func=run_render)
+
+    stress = commands.add_parser(
+        "stress-render", help="Check that concurrent renders match serial renders"
+    )
+    stress.add_argument("--threads", type=int, default=8)
+    stress.add_argument("--documents", type=int, default=32)
+    stress.add_argument("--rounds", type=int, default=5)
+    stress.set_defaults(func=run_stress)
+
+    # options (and --help) are parsed by the subcommand's handler
+    bench = commands.add_parser(
+        "bench", help="Benchmark extraction, LLM-stub and rendering stages", add_help=False
+    )
+    bench.set_defaults(func=run_bench, forward=True)
+
+    stub_server = commands.add_parser(
+        "stub-server",
+        help="Serve a local stand-in LLM for offline load tests (LLM_BACKEND=stub)",
+        add_help=False,
+    )
+    stub_server.set_defaults(func=run_stub_server, forward=True)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if rest and not getattr(args, "forward", False):
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.rest = rest
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+# ---------------- CONFIG ----------------
+
+# no events for this long before a file is looked at
+COALESCE_QUIET_SECONDS = float(os.getenv("COALESCE_QUIET_SECONDS", "2.0"))
+COALESCE_POLL_SECONDS = float(os.getenv("COALESCE_POLL_SECONDS", "0.5"))
+# consecutive polls with identical size/mtime before a file counts as complete
+COALESCE_STABLE_CHECKS = int(os.getenv("COALESCE_STABLE_CHECKS", "2"))
+# files still changing (or empty) after this long are dropped with a warning
+COALESCE_MAX_WAIT_SECONDS = float(os.getenv("COALESCE_MAX_WAIT_SECONDS", "600"))
+
+
+class EventCoalescer:
+    """Turns bursts of filesystem events into one "file is complete" callback.
+
+    Every created/modified/moved/closed event for a path only records the
+    time of the event. A background thread looks at paths that have been
+    quiet for ``quiet`` seconds and waits until their size and mtime stay
+    the same for ``stable_checks`` polls. A close-after-write event (Linux
+    inotify) counts as a strong hint, so one stable poll is enough. Paths
+    that become ready in the same poll are delivered together to
+    ``on_ready(paths)``.
+    """
+
+    def __init__(
+        self,
+        on_ready,
+        quiet=COALESCE_QUIET_SECONDS,
+        poll=COALESCE_POLL_SECONDS,
+        stable_checks=COALESCE_STABLE_CHECKS,
+        max_wait=COALESCE_MAX_WAIT_SECONDS,
+    ):
+        self.on_ready = on_ready
+        self.quiet = quiet
+        self.poll = poll
+        self.stable_checks = stable_checks
+        self.max_wait = max_wait
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-coalescer", daemon=True)
+        self._thread.start()
+
+    def touch(self, path, closed=False):
+        """Record an event for ``path``; restarts its quiet period."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pending.get(path)
+            if entry is None:
+                entry = self._pending[path] = {"first_event": now, "stat": None, "stable": 0}
+            entry["last_event"] = now
+            entry["stable"] = 0
+            entry["closed"] = closed
+
+    def discard(self, path):
+        with self._lock:
+            self._pending.pop(path, None)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def stop(self):
+        """Stop polling; files still pending are left for the next startup scan."""
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.poll):
+            ready = self._collect()
+            if not ready:
+                continue
+            try:
+                self.on_ready(ready)
+            except Exception as e:
+                print(f"[ERROR] Handling {len(ready)} completed file(s) failed: {e}")
+
+    def _collect(self):
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for path, entry in list(self._pending.items()):
+                if now - entry["last_event"] < self.quiet:
+                    continue
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    del self._pending[path]  # temp file renamed away or deleted
+                    continue
+
+                current = (st.st_size, st.st_mtime_ns)
+                if current == entry["stat"] and st.st_size > 0:
+                    entry["stable"] += 1
+                else:
+                    entry["stat"], entry["stable"] = current, 0
+
+                needed = 1 if entry["closed"] else self.stable_checks
+                if entry["stable"] >= needed:
+                    del self._pending[path]
+                    ready.append(path)
+                elif now - entry["first_event"] > self.max_wait:
+                    del self._pending[path]
+                    print(f"[WARN] {path} never settled after {self.max_wait:.0f}s; skipping")
+        return sorted(ready)
@@ -0,0 +1,246 @@
+import os
+import re
+
+from extractor import PAGE_BREAK
+from ratelimit import estimate_tokens
+
+# ---------------- CONFIG ----------------
+
+COMPACT_ENABLED = os.getenv("COMPACT_ENABLED", "1") != "0"
+# estimated tokens of resume text sent to the LLM (the system prompt is extra)
+COMPACT_TOKEN_BUDGET = int(os.getenv("COMPACT_TOKEN_BUDGET", "4000"))
+# repeated lines shorter than this are kept (skills, short labels)
+COMPACT_MIN_REPEAT_CHARS = int(os.getenv("COMPACT_MIN_REPEAT_CHARS", "12"))
+# lines at the top and bottom of a page where running headers/footers sit
+COMPACT_EDGE_LINES = int(os.getenv("COMPACT_EDGE_LINES", "3"))
+# bump when the rules change; part of the parse_data cache key
+COMPACT_VERSION = "2"
+
+LINKS_HEADER = "**Links found in document:**"
+TRIM_MARKER = "[...]"
+
+PAGE_NUMBER = re.compile(r"^\W*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?\W*$", re.IGNORECASE)
+PAGE_TOKEN = re.compile(r"\bpage\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?\b", re.IGNORECASE)
+TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+BULLET = re.compile(r"^([-*•●▪◦‣]|\d{1,2}[.)])\s")
+# entry headers ("Engineer | Acme | 2019 - 2022") and tech lines repeat
+# legitimately across entries and are never treated as page furniture
+ENTRY_DATES = re.compile(
+    r"\b(19|20)\d{2}\b.*?(-|–|—|\bto\b).*?(\b(19|20)\d{2}\b|present|current|now)",
+    re.IGNORECASE,
+)
+TECH_LABEL = re.compile(r"^(technologies|tech stack|tools|stack)\s*:", re.IGNORECASE)
+SPACES = re.compile(r"[ \t\u00a0]+")
+SECTION_NAMES = {
+    "summary",
+    "profile",
+    "objective",
+    "about me",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment history",
+    "education",
+    "skills",
+    "skillset",
+    "technical skills",
+    "projects",
+    "certifications",
+    "achievements",
+    "awards",
+    "publications",
+    "languages",
+    "interests",
+    "contact",
+}
+
+
+def is_heading(line):
+    """Markdown headings, ALL-CAPS lines and common resume section names."""
+    if line.startswith("#"):
+        return True
+    bare = line.strip("*_: ").strip()
+    if not bare or len(bare) > 40:
+        return False
+    if bare.lower() in SECTION_NAMES:
+        return True
+    letters = [c for c in bare if c.isalpha()]
+    return len(letters) >= 4 and all(c.isupper() for c in letters)
+
+
+def _table_row(line):
+    cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+    return " | ".join(cell for cell in cells if cell)
+
+
+def split_links(text):
+    head, sep, links = text.partition(LINKS_HEADER)
+    if not sep:
+        return text, []
+    head = head.rstrip().removesuffix("---").rstrip()
+    urls = [line[2:].strip() for line in links.splitlines() if line.startswith("- ")]
+    return head, urls
+
+
+def _clean_page(text):
+    """Non-empty lines of one page with whitespace, tables and page numbers cleaned."""
+    lines, dropped = [], 0
+    for raw in text.splitlines():
+        line = SPACES.sub(" ", raw).strip()
+        if line.startswith("|"):
+            if TABLE_SEPARATOR.match(line):
+                dropped += 1
+                continue
+            line = _table_row(line)
+        if line and PAGE_NUMBER.match(line):
+            dropped += 1
+            continue
+        lines.append(line)
+    return lines, dropped
+
+
+def _repeat_key(line):
+    """Comparison key for running headers/footers, or None for lines never dropped."""
+    if not line or BULLET.match(line) or ENTRY_DATES.search(line) or TECH_LABEL.match(line):
+        return None
+    key = PAGE_TOKEN.sub("", line).lower().strip(" |-–")
+    return key if len(key) >= COMPACT_MIN_REPEAT_CHARS else None
+
+
+def _page_furniture(pages):
+    """Keys of lines repeated at the edges of two or more pages, or on every page."""
+    pages = [[line for line in page if line] for page in pages]
+    pages = [page for page in pages if page]
+    if len(pages) < 2:
+        return set()
+    at_edges, anywhere = {}, {}
+    for number, page in enumerate(pages):
+        edges = page[:COMPACT_EDGE_LINES] + page[-COMPACT_EDGE_LINES:]
+        for lines, found in ((edges, at_edges), (page, anywhere)):
+            for line in lines:
+                key = _repeat_key(line)
+                if key:
+                    found.setdefault(key, set()).add(number)
+    return {key for key, seen in at_edges.items() if len(seen) >= 2} | {
+        key for key, seen in anywhere.items() if len(seen) == len(pages)
+    }
+
+
+def clean_lines(text):
+    """Collapse whitespace and tables and drop page numbers and page furniture.
+
+    Returns ``(lines, dropped)``. Pages are split on PAGE_BREAK. A line is a
+    running header or footer when it (ignoring case, spacing and any "Page
+    N" token) sits in the first or last COMPACT_EDGE_LINES of two or more
+    pages, or appears on every page; only its first occurrence is kept.
+    Bullets, entry headers, technologies lines and short labels are content
+    and are never dropped. Text without page breaks only loses page numbers.
+    """
+    pages, dropped = [], 0
+    for page in text.split(PAGE_BREAK):
+        page_lines, page_dropped = _clean_page(page)
+        pages.append(page_lines)
+        dropped += page_dropped
+
+    furniture = _page_furniture(pages)
+    lines, kept = [], set()
+    for page in pages:
+        for line in page + [""]:
+            if not line:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            key = _repeat_key(line)
+            if key in furniture:
+                if key in kept:
+                    dropped += 1
+                    continue
+                kept.add(key)
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines, dropped
+
+
+def split_sections(lines):
+    """Split into ``[heading or None, body lines]`` blocks."""
+    sections = [[None, []]]
+    for line in lines:
+        if line and is_heading(line):
+            sections.append([line, []])
+        else:
+            sections[-1][1].append(line)
+    return [s for s in sections if s[0] is not None or any(s[1])]
+
+
+def _render(sections):
+    lines = []
+    for heading, body in sections:
+        lines.extend(([heading] if heading else []) + body)
+    return "\n".join(lines)
+
+
+def trim_to_budget(lines, budget):
+    """Drop lines from the end of the largest sections until the text fits.
+
+    Every heading and the first body line of each section survive, so the
+    LLM still sees every section; a trimmed section ends with TRIM_MARKER.
+    Returns ``(text, trimmed_lines)``.
+    """
+    sections = split_sections(lines)
+    sizes = [estimate_tokens("\n".join(body)) for _, body in sections]
+    total = estimate_tokens(_render(sections))
+    trimmed = 0
+    while total > budget:
+        candidates = [
+            i
+            for i, (_, body) in enumerate(sections)
+            if body and len(body) - (body[-1] == TRIM_MARKER) > 1
+        ]
+        if not candidates:
+            break
+        index = max(candidates, key=lambda i: sizes[i])
+        body = sections[index][1]
+        if body[-1] == TRIM_MARKER:
+            body.pop()
+        removed = body.pop()
+        body.append(TRIM_MARKER)
+        trimmed += 1
+        saved = estimate_tokens(removed) if removed else 0
+        sizes[index] -= saved
+        total -= saved
+    return _render(sections), trimmed
+
+
+def compact(text, budget=COMPACT_TOKEN_BUDGET):
+    """Shrink extracted resume text for the LLM prompt.
+
+    Returns ``(text, stats)`` with the estimated tokens before and after.
+    Links already present in the body are removed from the "Links found in
+    document" appendix, which is otherwise kept whole and outside the budget
+    (the prompt relies on it for URLs that have no visible text).
+    """
+    body, urls = split_links(text)
+    lines, dropped = clean_lines(body)
+    result, trimmed = trim_to_budget(lines, budget)
+
+    urls = [
+        url for url in dict.fromkeys(urls) if url.removeprefix("mailto:") not in result
+    ]
+    if urls:
+        result += f"\n\n---\n{LINKS_HEADER}\n" + "\n".join(f"- {url}" for url in urls)
+
+    stats = {
+        "tokens_before": estimate_tokens(text),
+        "tokens_after": estimate_tokens(result),
+        "lines_dropped": dropped,
+        "lines_trimmed": trimmed,
+    }
+    return result, stats
+
+
+def cache_tag():
+    """Identifies the compaction settings in the parse_data cache key."""
+    if not COMPACT_ENABLED:
+        return "raw"
+    return f"c{COMPACT_VERSION}-{COMPACT_TOKEN_BUDGET}"
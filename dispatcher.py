@@ -0,0 +1,259 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import agent
+import metrics
+from status import get_status_store
+
+# ---------------- CONFIG ----------------
+
+QUEUE_SIZE = int(os.getenv("DISPATCH_QUEUE_SIZE", "64"))
+PARSE_WORKERS = int(os.getenv("DISPATCH_PARSE_WORKERS", str(os.cpu_count() or 2)))
+LLM_WORKERS = int(os.getenv("DISPATCH_LLM_WORKERS", "4"))
+RENDER_WORKERS = int(os.getenv("DISPATCH_RENDER_WORKERS", str(os.cpu_count() or 2)))
+PARSE_EXECUTOR = os.getenv("DISPATCH_PARSE_EXECUTOR", "process")
+RENDER_EXECUTOR = os.getenv("DISPATCH_RENDER_EXECUTOR", "process")
+
+# stage name -> agent node, in pipeline order (mirrors the edges in agent.workflow)
+STAGES = (
+    ("parse", "get_content_markdown"),
+    ("heuristic", "get_content_heuristic"),
+    ("llm", "get_content_strutured"),
+    ("render", "generate_PDF"),
+)
+# stages without an executor of their own
+STAGE_EXECUTORS = {"heuristic": "parse"}
+
+
+def run_stage(node_name, state):
+    """Run one agent node and time it. Module level so process pools can pickle it."""
+    started = time.perf_counter()
+    result = getattr(agent, node_name)(state)
+    return result, time.perf_counter() - started
+
+
+def next_stage(index, state):
+    """Index of the stage after ``index``; agent.route_structured skips the LLM."""
+    index += 1
+    if (
+        index < len(STAGES)
+        and STAGES[index][0] == "llm"
+        and agent.route_structured(state) != "get_content_structured"
+    ):
+        index += 1
+    return index
+
+
+def _make_executor(kind, workers, prefix):
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=prefix)
+
+
+class ResumeDispatcher:
+    """Bounded, staged worker pool for the resume pipeline.
+
+    Files are accepted into a bounded queue; ``submit`` blocks (or raises
+    ``queue.Full`` after ``timeout``) once it is full, which is the backpressure
+    seen by the watchdog thread. Each stage has its own executor, so parse and
+    render run in process pools while the LLM stage runs in a thread pool, and
+    each executor's size is that stage's concurrency limit.
+    """
+
+    def __init__(
+        self,
+        queue_size=QUEUE_SIZE,
+        parse_workers=PARSE_WORKERS,
+        llm_workers=LLM_WORKERS,
+        render_workers=RENDER_WORKERS,
+        parse_executor=PARSE_EXECUTOR,
+        render_executor=RENDER_EXECUTOR,
+    ):
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._executors = {
+            "parse": _make_executor(parse_executor, parse_workers, "parse"),
+            "llm": ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="llm"),
+            "render": _make_executor(render_executor, render_workers, "render"),
+        }
+        # Jobs admitted past the queue; keeps executor-internal queues short.
+        self._slots = threading.BoundedSemaphore(
+            parse_workers + llm_workers + render_workers
+        )
+        self._closed = False
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._status = get_status_store()
+        self._feeder = threading.Thread(
+            target=self._feed, name="resume-dispatcher", daemon=True
+        )
+        self._feeder.start()
+        metrics.REGISTRY.gauge(
+            "resume_dispatch_queue_depth", "Files waiting for a stage slot", self.pending
+        )
+        metrics.REGISTRY.gauge(
+            "resume_dispatch_in_flight", "Files inside a pipeline stage", self.in_flight
+        )
+        print(
+            f"[INFO] Dispatcher started (queue={queue_size}, parse={parse_workers}/{parse_executor}, "
+            f"llm={llm_workers}, render={render_workers}/{render_executor})"
+        )
+
+    # ---------------- PUBLIC ----------------
+
+    def submit(self, file_path, block=True, timeout=None):
+        """Queue a file for processing and return a Future of its result dict."""
+        if self._closed:
+            raise RuntimeError("Dispatcher is shut down")
+        job = {
+            "id": uuid.uuid4().hex,
+            "file_path": file_path,
+            "future": Future(),
+            "timings": {},
+            "submitted": time.perf_counter(),
+        }
+        if self._status:
+            self._status.job_queued(job["id"], file_path, "dispatcher")
+        try:
+            self._queue.put(job, block=block, timeout=timeout)
+        except queue.Full:
+            if self._status:
+                self._status.job_finished(job["id"], job["timings"], error="queue full")
+            raise
+        self._publish()
+        return job["future"]
+
+    def pending(self):
+        """Number of files waiting in the queue (not yet admitted to a stage)."""
+        return self._queue.qsize()
+
+    def in_flight(self):
+        """Number of files currently inside one of the stages."""
+        with self._lock:
+            return self._in_flight
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop accepting files and drain.
+
+        With ``wait`` the call returns only after every queued and in-flight
+        file has finished. ``cancel_pending`` drops files still in the queue.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        print("[INFO] Dispatcher shutting down")
+
+        if cancel_pending:
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job["future"].cancel()
+                    if self._status:
+                        self._status.job_finished(job["id"], job["timings"], error="cancelled")
+                self._queue.task_done()
+
+        self._queue.put(None)
+        if wait:
+            self._feeder.join()
+            self._queue.join()
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        print("[INFO] Dispatcher stopped")
+
+    # ---------------- INTERNAL ----------------
+
+    def _publish(self):
+        """Copy queue depth and in-flight count to the shared status store."""
+        if self._status:
+            self._status.set_gauge("dispatch_queue_depth", self.pending())
+            self._status.set_gauge("dispatch_in_flight", self.in_flight())
+
+    def _feed(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            self._slots.acquire()
+            with self._lock:
+                self._in_flight += 1
+            self._publish()
+            self._run(job, 0, {"file_path": job["file_path"]})
+
+    def _run(self, job, index, state):
+        stage, node_name = STAGES[index]
+        if self._status:
+            self._status.job_stage(job["id"], stage, job["timings"])
+        try:
+            executor = self._executors[STAGE_EXECUTORS.get(stage, stage)]
+            future = executor.submit(run_stage, node_name, state)
+        except Exception as e:
+            self._finish(job, state, f"{stage}: {e}")
+            return
+        future.add_done_callback(lambda f: self._advance(job, index, f))
+
+    def _advance(self, job, index, future):
+        stage = STAGES[index][0]
+        try:
+            result, elapsed = future.result()
+        except Exception as e:
+            self._finish(job, {}, f"{stage}: {e}")
+            return
+
+        job["timings"][stage] = round(elapsed, 4)
+        if isinstance(result, dict):
+            # kept so a later failure still logs the stages that completed
+            job["metrics"] = result.get("metrics")
+
+        # Nodes report failure by returning a string or an "error" key.
+        if not isinstance(result, dict):
+            self._finish(job, {}, f"{stage}: {result}")
+            return
+        if result.get("error"):
+            self._finish(job, result, f"{stage}: {result['error']}")
+            return
+
+        index = next_stage(index, result)
+        if index < len(STAGES):
+            self._run(job, index, result)
+        else:
+            self._finish(job, result, None)
+
+    def _finish(self, job, state, error):
+        job["timings"]["total"] = round(time.perf_counter() - job["submitted"], 4)
+        result = {
+            "file_path": job["file_path"],
+            "status": "failed" if error else "done",
+            "error": error,
+            "output_file": state.get("output_file"),
+            "timings": job["timings"],
+        }
+        if error:
+            print(f"[ERROR] {job['file_path']} failed at {error}")
+        else:
+            print(f"[INFO] {job['file_path']} done in {result['timings']['total']}s")
+        metrics.record_job(
+            state.get("metrics") or job.get("metrics"),
+            result["status"],
+            source="dispatcher",
+            total_seconds=job["timings"]["total"],
+            error=error,
+            failed_stage=error.split(":", 1)[0] if error else None,
+            file_path=job["file_path"],
+            output_file=result["output_file"],
+        )
+
+        if self._status:
+            self._status.job_finished(job["id"], job["timings"], error, result["output_file"])
+        with self._lock:
+            self._in_flight -= 1
+        self._publish()
+        self._slots.release()
+        self._queue.task_done()
+        job["future"].set_result(result)
@@ -0,0 +1,190 @@
+import hashlib
+import io
+import mmap
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+# pdfplumber and markitdown are imported by the extract methods that use them;
+# markitdown[all] alone takes most of a second to import.
+
+# markdown links emitted by MarkItDown for DOCX hyperlinks, e.g. [me](https://...)
+MARKDOWN_LINK = re.compile(r"\]\(((?:https?://|mailto:)[^)\s]+)\)")
+# separates PDF pages in ExtractedDocument.text (compaction finds running
+# headers and footers per page)
+PAGE_BREAK = "\f"
+# part of the markdown cache key; bump when the extracted text changes
+EXTRACT_VERSION = "2"
+
+
+def _markdown_table(rows):
+    """Markdown rows for a pdfplumber table; empty cells are kept so columns line up."""
+    lines = [
+        "| " + " | ".join(" ".join((cell or "").split()) for cell in row) + " |"
+        for row in rows
+    ]
+    if len(lines) > 1:
+        lines.insert(1, "|" + "---|" * len(rows[0]))
+    return "\n".join(lines)
+
+
+def _page_text(page):
+    """Page text with ruled tables (main.py's Skillset grid) as markdown rows.
+
+    Plain text extraction joins a table row's cells with single spaces, which
+    loses the column boundaries; the text above, between and below tables
+    is extracted as usual.
+    """
+    tables = sorted(page.find_tables(), key=lambda table: table.bbox[1])
+    if not tables:
+        return page.extract_text()
+    parts, top = [], page.bbox[1]
+    for table in tables:
+        _, table_top, _, table_bottom = table.bbox
+        if table_top > top:
+            parts.append(page.crop((page.bbox[0], top, page.bbox[2], table_top)).extract_text())
+        parts.append(_markdown_table(table.extract()))
+        top = max(top, table_bottom)
+    if top < page.bbox[3]:
+        parts.append(page.crop((page.bbox[0], top, page.bbox[2], page.bbox[3])).extract_text())
+    return "\n".join(part.strip() for part in parts if part and part.strip())
+
+
+@dataclass
+class ExtractedDocument:
+    text: str
+    links: list = field(default_factory=list)
+    layout: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+
+    def to_markdown(self):
+        """Text plus the "Links found in document" appendix the LLM prompt expects."""
+        markdown_text = self.text
+        if self.links:
+            markdown_text += "\n\n---\n**Links found in document:**\n"
+            for url in sorted(set(self.links)):
+                markdown_text += f"- {url}\n"
+        return markdown_text
+
+
+class DocumentReader:
+    """Reads a resume once and extracts text, links and layout from that buffer.
+
+    Files are memory-mapped; uploaded bytes can be passed directly with
+    ``data``. The same buffer feeds the content hash and the single parser
+    pass, and every stage is timed in ``timings``::
+
+        with DocumentReader("ResumeFolder/cv.pdf") as reader:
+            key = reader.content_hash()
+            doc = reader.extract()
+    """
+
+    def __init__(self, file_path=None, data=None, extension=None):
+        if file_path is None and data is None:
+            raise ValueError("DocumentReader needs a file_path or data")
+        self.file_path = file_path
+        self.extension = (
+            extension or os.path.splitext(file_path or "")[1]
+        ).lower()
+        self.timings = {}
+        self._data = data
+        self._file = None
+        self._buffer = None
+        self._hash = None
+
+    def __enter__(self):
+        started = time.perf_counter()
+        if self._data is not None:
+            self._buffer = self._data
+        else:
+            self._file = open(self.file_path, "rb")
+            if os.fstat(self._file.fileno()).st_size:
+                self._buffer = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                self._buffer = b""  # empty files cannot be mapped
+        self.timings["read"] = time.perf_counter() - started
+        return self
+
+    def __exit__(self, *exc):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file:
+            self._file.close()
+        self._buffer = None
+        return False
+
+    def content_hash(self):
+        """SHA-256 of the document bytes (same value as cache.file_hash)."""
+        if self._hash is None:
+            started = time.perf_counter()
+            self._hash = hashlib.sha256(self._buffer).hexdigest()
+            self.timings["hash"] = time.perf_counter() - started
+        return self._hash
+
+    def extract(self):
+        started = time.perf_counter()
+        if self.extension == ".pdf":
+            doc = self._extract_pdf()
+        else:
+            doc = self._extract_markitdown()
+        self.timings["parse"] = time.perf_counter() - started
+        doc.timings = {k: round(v, 4) for k, v in self.timings.items()}
+        print(f"[INFO] Extraction timings for {self.file_path or 'upload'}: {doc.timings}")
+        return doc
+
+    def _stream(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.seek(0)
+            return self._buffer
+        return io.BytesIO(self._buffer)
+
+    def _extract_pdf(self):
+        # One pdfplumber pass yields text, annotation links and page geometry;
+        # pages are closed as we go to keep memory flat on long documents.
+        import pdfplumber
+
+        pages_text, links, page_sizes, chars = [], [], [], 0
+        with pdfplumber.open(self._stream()) as pdf:
+            for page in pdf.pages:
+                page_text = _page_text(page)
+                if page_text and page_text.strip():
+                    pages_text.append(page_text.strip())
+                for annot in page.annots or []:
+                    uri = annot.get("uri")
+                    if uri:
+                        links.append(uri)
+                page_sizes.append((float(page.width), float(page.height)))
+                chars += len(page.chars)
+                page.close()
+
+        return ExtractedDocument(
+            text=f"\n{PAGE_BREAK}\n".join(pages_text),
+            links=links,
+            layout={
+                "format": "pdf",
+                "pages": len(page_sizes),
+                "page_sizes": page_sizes,
+                "chars": chars,
+            },
+        )
+
+    def _extract_markitdown(self):
+        # DOCX (and anything else MarkItDown handles): hyperlinks already come
+        # out as markdown links, so they are collected from the text instead of
+        # parsing the package a second time.
+        from markitdown import MarkItDown, StreamInfo
+
+        md = MarkItDown(enable_plugins=False)
+        result = md.convert_stream(
+            io.BytesIO(self._buffer),
+            stream_info=StreamInfo(extension=self.extension or None),
+        )
+        text = result.text_content
+        return ExtractedDocument(
+            text=text,
+            links=MARKDOWN_LINK.findall(text),
+            layout={"format": self.extension.lstrip(".") or "unknown"},
+        )
@@ -0,0 +1,430 @@
+import os
+import re
+
+import compaction
+import schema
+
+# ---------------- CONFIG ----------------
+
+HEURISTIC_ENABLED = os.getenv("HEURISTIC_ENABLED", "1") != "0"
+# documents scoring below this go to the LLM (get_content_strutured)
+HEURISTIC_MIN_CONFIDENCE = float(os.getenv("HEURISTIC_MIN_CONFIDENCE", "0.9"))
+# confidence multiplier for each missing core field (name, contact, skills,
+# experience) and each STRUCTURED_FIELDS section with lines left unparsed
+MISSING_PENALTY = 0.5
+STRUCTURED_FIELDS = ("Professional History", "Skillset", "Project Showcase")
+
+# heading words -> schema field, first match wins ("career summary" before "summary")
+FIELD_HEADINGS = (
+    ("career summary", "Career Summary"),
+    ("highlights", "Career Summary"),
+    ("objective", "summary"),
+    ("summary", "summary"),
+    ("profile", "summary"),
+    ("about", "summary"),
+    ("experience", "Professional History"),
+    ("employment", "Professional History"),
+    ("work history", "Professional History"),
+    ("skill", "Skillset"),
+    ("technolog", "Skillset"),
+    ("competenc", "Skillset"),
+    ("project", "Project Showcase"),
+    ("education", "Education"),
+    ("academic", "Education"),
+    ("qualification", "Education"),
+)
+# sections the LLM prompt leaves out as well; their lines do not count
+IGNORED_HEADINGS = (
+    "certification",
+    "award",
+    "achievement",
+    "language",
+    "interest",
+    "hobbies",
+    "publication",
+    "reference",
+    "volunteer",
+    "declaration",
+)
+# domains the prompt asks for; in a "Domain / Category: skills" label a
+# slash inside one of these ("AI / ML") is not the separator
+SKILL_DOMAINS = ("AI / ML", "Backend", "Cloud", "Data", "DevOps", "Tools", "UI")
+SKILL_TABLE_HEADER = ("domain", "category", "skills")
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?(?:\d{{1,2}}/)?\d{{4}}"
+TIMESPAN = re.compile(
+    rf"{DATE}\s*(?:-|–|—|to)\s*(?:{DATE}|present|current|now|till date)", re.IGNORECASE
+)
+YEAR = re.compile(r"[\s,(|–-]*\b(19|20)\d{2}\b[)\s]*")
+TITLE_SEPARATOR = re.compile(r"\s+(?:at|@)\s+|\s+[-–—|]\s+|,\s+")
+TECH_LINE = re.compile(r"^(?:technologies|tech stack|tools|stack)\s*:\s*(.+)$", re.IGNORECASE)
+TECH_SUFFIX = re.compile(r"^(.+?)\s*\(([^()]+)\)$")
+CID_BULLET = re.compile(r"^\(cid:\d+\)\s*")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+URL = re.compile(r"(?:https?://)?(?:www\.)?(linkedin\.com/in|github\.com)/([\w-]+)", re.IGNORECASE)
+LOCATION = re.compile(r"^[A-Z][A-Za-z .'-]+,\s*[A-Z][A-Za-z .'-]+$")
+NAME = re.compile(r"^[^\W\d_][\w .'-]*$")
+
+
+def _field_for(heading):
+    bare = heading.strip("#*_: ").lower()
+    for word, field in FIELD_HEADINGS:
+        if word in bare:
+            return field
+    if any(word in bare for word in IGNORED_HEADINGS):
+        return "ignored"
+    return None
+
+
+def _undouble(token):
+    """``++9911`` -> ``+91``: pdfplumber reads fake-bold header text twice."""
+    if len(token) >= 4 and len(token) % 2 == 0 and token[::2] == token[1::2]:
+        return token[::2]
+    return token
+
+
+def _clean(line):
+    line = CID_BULLET.sub("- ", line.replace("**", "").replace("__", ""))
+    return line.strip()
+
+
+def _bullet(line):
+    match = compaction.BULLET.match(line)
+    return line[match.end() :].strip() if match else None
+
+
+def _is_entry_marker(line):
+    """Lines that belong to an entry header: a bare timespan or a tech line."""
+    return bool(TECH_LINE.match(line)) or bool(
+        TIMESPAN.fullmatch(line.strip("()[] "))
+    )
+
+
+def _items(lines):
+    """``[(is_bullet, text)]`` with wrapped bullet lines joined back together.
+
+    A plain line after a bullet continues it unless the bullet already ends
+    a sentence or the line starts an entry (it is, or is followed by, a
+    timespan or technologies line).
+    """
+    items = []
+    for i, line in enumerate(lines):
+        text = _bullet(line)
+        if text is not None:
+            items.append([True, text])
+            continue
+        following = lines[i + 1] if i + 1 < len(lines) else ""
+        if (
+            items
+            and items[-1][0]
+            and not items[-1][1].endswith((".", "!", "?"))
+            and not _is_entry_marker(line)
+            and not _is_entry_marker(following)
+            and not TIMESPAN.search(line)
+        ):
+            items[-1][1] += " " + line
+            continue
+        items.append([False, line])
+    return [tuple(item) for item in items]
+
+
+def _lines(text):
+    """Non-blank lines with whitespace collapsed, table rows flattened and
+    separators and page numbers dropped.
+
+    Unlike compaction.clean_lines nothing is deduplicated: every line,
+    repeated or not, must be accounted for by a parser.
+    """
+    lines = []
+    for raw in text.splitlines():
+        line = compaction.SPACES.sub(" ", raw).strip()
+        if line.startswith("|"):  # keep empty cells: columns are positional
+            line = "| " + " | ".join(cell.strip() for cell in line.strip("|").split("|")) + " |"
+        if not line or compaction.TABLE_SEPARATOR.match(line) or compaction.PAGE_NUMBER.match(line):
+            continue
+        lines.append(_clean(line))
+    return lines
+
+
+def _split_list(text):
+    return [part.strip() for part in re.split(r",|;", text) if part.strip()]
+
+
+# ---------------- FIELDS ----------------
+# Each parser returns ``(value, parsed_lines, total_lines)``.
+
+
+def parse_contact(header, urls):
+    text = "\n".join(header)
+    contact = dict.fromkeys(schema.CONTACT_KEYS, "None")
+    email = EMAIL.search(text)
+    if email:
+        contact["email"] = email.group(0).lower()
+    phone = PHONE.search(" ".join(_undouble(t) for t in text.split()))
+    if phone:
+        contact["phone"] = " ".join(phone.group(0).split())
+    for match in URL.finditer(text + "\n" + "\n".join(urls)):
+        key = "linkedin" if match.group(1).lower().startswith("linkedin") else "github"
+        if contact[key] == "None":
+            contact[key] = f"https://{match.group(1).lower()}/{match.group(2)}"
+    for line in header:
+        for part in re.split(r"\s*[|•·]\s*", line):
+            if LOCATION.match(part) and not EMAIL.search(part):
+                contact["location"] = part
+                break
+    return contact
+
+
+def parse_header(header, urls):
+    """Name and contact from the lines above the first heading."""
+    name, parsed = "", 0
+    for line in header:
+        has_contact = EMAIL.search(line) or PHONE.search(line) or URL.search(line)
+        if has_contact or LOCATION.match(line):
+            parsed += 1
+        elif not name and NAME.match(line) and 1 < len(line.split()) <= 6:
+            name = line.strip()
+            parsed += 1
+    return name, parse_contact(header, urls), parsed, len(header)
+
+
+def parse_paragraphs(lines):
+    """Summary sentences; wrapped lines are joined first."""
+    text = " ".join(_bullet(line) or line for line in lines)
+    return [s.strip() for s in SENTENCE_END.split(text) if s.strip()], len(lines), len(lines)
+
+
+def parse_list(lines, strip_years=False):
+    values = []
+    for _, text in _items(lines):
+        if strip_years:
+            text = YEAR.sub(" ", text).strip(" ,|-–")
+        if text:
+            values.append(text)
+    return values, len(lines), len(lines)
+
+
+def _table_cells(line):
+    """Cells of a ``a | b | c`` table row, empty ones included; None for other lines."""
+    if "|" not in line:
+        return None
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _add_skills(skills, domain, category, values):
+    """File one table row; False when it clashes with what the domain already holds."""
+    if not category:
+        if domain in skills:
+            return False
+        skills[domain] = values
+        return True
+    categories = skills.setdefault(domain, {})
+    if not isinstance(categories, dict):
+        return False
+    group = re.fullmatch(r"(.+?)\s*\(([^()]+)\)", category)  # "Databases (SQL)"
+    if group:
+        nested = categories.setdefault(group.group(1), {})
+        if not isinstance(nested, dict):
+            return False
+        nested[group.group(2)] = values
+    else:
+        categories[category] = values
+    return True
+
+
+def _skill_label(label):
+    """``(domain, "/", category)``; known domains may contain a slash themselves."""
+    for domain in SKILL_DOMAINS:
+        if label.startswith(domain + " /"):
+            return domain, "/", label[len(domain) + 2 :].strip()
+    return tuple(part.strip() for part in label.partition("/"))
+
+
+def parse_skills(lines):
+    """Skillset from ``Domain | Category | Skills`` rows or ``Label: a, b`` lines.
+
+    Table rows are split on their cells, not on known names. An empty domain
+    cell continues the previous row's domain (main.py's table leaves it
+    blank after the first row), an empty category makes the domain a plain
+    list, and ``Databases (SQL)`` is the SQL group of Databases.
+    """
+    skills, parsed, domain = {}, 0, None
+    for line in lines:
+        text = _bullet(line) or line
+        cells = _table_cells(text)
+        if cells is not None:
+            if tuple(cell.lower() for cell in cells) == SKILL_TABLE_HEADER:
+                parsed += 1
+                continue
+            if len(cells) == 3 and (cells[0] or domain) and cells[2]:
+                domain = cells[0] or domain
+                if not _add_skills(skills, domain, cells[1], _split_list(cells[2])):
+                    continue
+            elif len(cells) == 2 and all(cells):
+                skills[cells[0]] = _split_list(cells[1])
+            else:
+                continue
+        elif ":" in text:
+            label, _, values = text.partition(":")
+            label_domain, _, category = _skill_label(label)
+            if category:
+                skills.setdefault(label_domain, {})[category] = _split_list(values)
+            else:
+                skills[label_domain] = _split_list(values)
+        else:
+            continue
+        parsed += 1
+    return skills, parsed, len(lines)
+
+
+def _title_company(text):
+    text = re.sub(r"\(\s*\)|\[\s*\]", "", text).strip(" |,-–—")
+    parts = TITLE_SEPARATOR.split(text, maxsplit=1)
+    if len(parts) != 2 or not all(p.strip() for p in parts):
+        return None
+    return parts[0].strip(), parts[1].strip(" |,-–—")
+
+
+def parse_experience(lines):
+    """Entries from ``Title at/-/| Company`` headers with a timespan on or below them."""
+    items = _items(lines)
+    entries, parsed, i = [], 0, 0
+    while i < len(items):
+        is_bullet, text = items[i]
+        if is_bullet:
+            if entries:
+                entries[-1]["points"].append(text)
+                parsed += 1
+            i += 1
+            continue
+        span = TIMESPAN.search(text)
+        header, used = text, 1
+        if not span and i + 1 < len(items) and not items[i + 1][0]:
+            span = TIMESPAN.fullmatch(items[i + 1][1].strip("()[] "))
+            used = 2 if span else 1
+        elif span:
+            header = text[: span.start()] + text[span.end() :]
+        title_company = _title_company(header) if span else None
+        if title_company:
+            entries.append(
+                {
+                    "title": title_company[0],
+                    "company": title_company[1],
+                    "timespan": span.group(0),
+                    "points": [],
+                }
+            )
+            parsed += used
+        i += used
+    return entries, parsed, len(items)
+
+
+def parse_projects(lines):
+    """Entries from a title line, with technologies in brackets or on a tech line.
+
+    A plain line is a title only when it has a bracketed tech list or is
+    followed by a tech line or a bullet; other prose (a wrapped description
+    paragraph) is left unparsed so the section counts as partial.
+    """
+    items = _items(lines)
+    projects, parsed = [], 0
+    for i, (is_bullet, text) in enumerate(items):
+        if is_bullet:
+            if projects:
+                projects[-1]["points"].append(text)
+                parsed += 1
+            continue
+        tech = TECH_LINE.match(text)
+        if tech:
+            if projects and not projects[-1]["technologies"]:
+                projects[-1]["technologies"] = _split_list(tech.group(1))
+                parsed += 1
+            continue
+        suffix = TECH_SUFFIX.match(text)
+        following = items[i + 1] if i + 1 < len(items) else None
+        if suffix and "," in suffix.group(2):
+            projects.append(
+                {"title": suffix.group(1), "technologies": _split_list(suffix.group(2)), "points": []}
+            )
+        elif following and (following[0] or TECH_LINE.match(following[1])):
+            projects.append({"title": text, "technologies": [], "points": []})
+        else:
+            continue
+        parsed += 1
+    return projects, parsed, len(items)
+
+
+PARSERS = {
+    "summary": parse_paragraphs,
+    "Career Summary": parse_list,
+    "Professional History": parse_experience,
+    "Skillset": parse_skills,
+    "Project Showcase": parse_projects,
+    "Education": lambda lines: parse_list(lines, strip_years=True),
+}
+
+
+# ---------------- EXTRACT ----------------
+
+
+def extract(content):
+    """Rule-based parse_data for ``content``; returns ``(parse_data, confidence, stats)``.
+
+    Confidence is the share of non-blank lines a rule accounted for (lines
+    under headings the prompt ignores, such as Certifications, do not
+    count), halved for each missing core field (name, email or phone,
+    skills, experience or projects) and for each STRUCTURED_FIELDS section
+    with a line no rule understood, since that line's data would be lost.
+    """
+    body, urls = compaction.split_links(content)
+    header, blocks = [], []
+    for heading, block in compaction.split_sections(_lines(body)):
+        if heading is None:
+            header.extend(block)
+        else:
+            blocks.append((_field_for(heading), block))
+
+    name, contact, parsed, total = parse_header(header, urls)
+    fields, partial = {"name": name, "contact": contact}, []
+    for field, block in blocks:
+        if field == "ignored":
+            continue
+        total += len(block) + 1
+        if field is None:
+            continue
+        value, field_parsed, field_total = PARSERS[field](block)
+        parsed += field_parsed + 1
+        total += field_total - len(block)
+        if field_parsed < field_total and field in STRUCTURED_FIELDS:
+            partial.append(field)
+        if isinstance(value, dict) and isinstance(fields.get(field), dict):
+            fields[field].update(value)
+        elif isinstance(value, list) and isinstance(fields.get(field), list):
+            fields[field].extend(value)
+        else:
+            fields[field] = value
+
+    missing = [
+        label
+        for label, present in (
+            ("name", name),
+            ("contact", contact["email"] != "None" or contact["phone"] != "None"),
+            ("skills", fields.get("Skillset")),
+            ("experience", fields.get("Professional History") or fields.get("Project Showcase")),
+        )
+        if not present
+    ]
+    coverage = parsed / total if total else 0.0
+    confidence = round(coverage * MISSING_PENALTY ** (len(missing) + len(partial)), 3)
+    parse_data = schema.validate(schema.assemble(fields))
+    stats = {
+        "confidence": confidence,
+        "coverage": round(coverage, 3),
+        "missing": missing,
+        "partial": partial,
+        "lines": total,
+    }
+    return parse_data, confidence, stats
@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# ---------------- CONFIG ----------------
+
+JOB_DIR = os.getenv("JOB_DIR", "JobStore")
+JOB_DB = os.path.join(JOB_DIR, "jobs.db")
+UPLOAD_DIR = os.path.join(JOB_DIR, "uploads")
+JOB_OUTPUT_DIR = os.path.join(JOB_DIR, "output")
+# running jobs older than this are assumed to belong to a dead worker
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "900"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+COLUMNS = (
+    "id",
+    "file_hash",
+    "filename",
+    "upload_path",
+    "status",
+    "attempts",
+    "worker",
+    "error",
+    "output_file",
+    "timings",
+    "created_at",
+    "started_at",
+    "finished_at",
+)
+
+
+def _row(row):
+    if row is None:
+        return None
+    job = dict(zip(COLUMNS, row))
+    job["timings"] = json.loads(job["timings"]) if job["timings"] else {}
+    return job
+
+
+class JobQueue:
+    """Persistent job queue in SQLite, shared by the API and worker processes.
+
+    A job is keyed by the uploaded file's content hash, so submitting the same
+    resume twice returns the existing job. Workers claim jobs with a single
+    ``BEGIN IMMEDIATE`` transaction, so any number of worker processes can
+    poll the same database.
+    """
+
+    def __init__(self, path=JOB_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL UNIQUE,
+                filename TEXT,
+                upload_path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                error TEXT,
+                output_file TEXT,
+                timings TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+        )
+
+    def submit(self, file_hash, filename, upload_path):
+        """Queue a job, or return the existing one for the same content.
+
+        Returns ``(job, created)``. Failed jobs are re-queued on resubmission.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = _row(
+                    self._conn.execute(
+                        f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE file_hash = ?",
+                        (file_hash,),
+                    ).fetchone()
+                )
+                if existing and existing["status"] != FAILED:
+                    self._conn.execute("COMMIT")
+                    return existing, False
+                if existing:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = 0, error = NULL, "
+                        "created_at = ? WHERE id = ?",
+                        (QUEUED, now, existing["id"]),
+                    )
+                    job_id = existing["id"]
+                else:
+                    job_id = uuid.uuid4().hex
+                    self._conn.execute(
+                        "INSERT INTO jobs (id, file_hash, filename, upload_path, status, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (job_id, file_hash, filename, upload_path, QUEUED, now),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(job_id), True
+
+    def get(self, job_id):
+        with self._lock:
+            return _row(
+                self._conn.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+            )
+
+    def claim(self, worker):
+        """Atomically take the oldest queued job for ``worker``; None if idle.
+
+        Jobs that already used JOB_MAX_ATTEMPTS are never handed out again.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                UPDATE jobs
+                SET status = ?, worker = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = ? AND attempts < ?
+                    ORDER BY created_at LIMIT 1
+                )
+                RETURNING {', '.join(COLUMNS)}
+                """,
+                (RUNNING, worker, time.time(), QUEUED, JOB_MAX_ATTEMPTS),
+            ).fetchone()
+        return _row(row)
+
+    def complete(self, job_id, output_file, timings):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, output_file = ?, timings = ?, error = NULL, "
+                "finished_at = ? WHERE id = ?",
+                (DONE, output_file, json.dumps(timings), time.time(), job_id),
+            )
+
+    def fail(self, job_id, error, timings=None):
+        """Record a failure; the job is re-queued until JOB_MAX_ATTEMPTS is reached."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "error = ?, timings = ?, finished_at = ? WHERE id = ?",
+                (
+                    JOB_MAX_ATTEMPTS,
+                    QUEUED,
+                    FAILED,
+                    error,
+                    json.dumps(timings or {}),
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def requeue_stale(self, lease_seconds=JOB_LEASE_SECONDS):
+        """Put jobs back in the queue whose worker stopped without finishing them.
+
+        A job that has already used JOB_MAX_ATTEMPTS is marked failed instead,
+        so a resume that keeps killing its worker is not retried forever.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN ? ELSE ? END, "
+                "worker = NULL, "
+                "error = CASE WHEN attempts < ? THEN error ELSE ? END, "
+                "finished_at = CASE WHEN attempts < ? THEN finished_at ELSE ? END "
+                "WHERE status = ? AND started_at < ? RETURNING status",
+                (
+                    JOB_MAX_ATTEMPTS,
+                    QUEUED,
+                    FAILED,
+                    JOB_MAX_ATTEMPTS,
+                    "worker lease expired on the last attempt",
+                    JOB_MAX_ATTEMPTS,
+                    now,
+                    RUNNING,
+                    now - lease_seconds,
+                ),
+            ).fetchall()
+        failed = sum(1 for (status,) in rows if status == FAILED)
+        if len(rows) - failed:
+            print(f"[WARN] Re-queued {len(rows) - failed} stale job(s)")
+        if failed:
+            print(f"[WARN] Failed {failed} stale job(s) after {JOB_MAX_ATTEMPTS} attempts")
+        return len(rows)
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
@@ -0,0 +1,305 @@
+import json
+import os
+import re
+
+import schema
+
+# ---------------- CONFIG ----------------
+
+# follow-up calls for fields that were cut off or invalid (0 disables)
+JSON_REPAIR_ATTEMPTS = int(os.getenv("LLM_JSON_REPAIR_ATTEMPTS", "1"))
+# candidate cut points tried by ``repair`` before giving up
+REPAIR_MAX_CUTS = 20
+
+CLOSERS = {"{": "}", "[": "]"}
+# the only characters the parser has to look at, outside and inside strings
+STRUCTURAL = re.compile(r'[{}\[\],:"]')
+STRING_SPECIAL = re.compile(r'["\\]')
+
+
+def strip_trailing_commas(text):
+    """Drop commas directly before ``}`` or ``]`` (outside strings)."""
+    out, in_string, escape = [], False, False
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+        out.append(c)
+    return "".join(out)
+
+
+def _scan(text):
+    """Open containers, string state and cut points at the end of ``text``."""
+    stack, cuts, in_string, escape = [], [], False, False
+    for i, c in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            stack.append(c)
+            cuts.append(i + 1)
+        elif c in "}]":
+            if stack:
+                stack.pop()
+        elif c == ",":
+            cuts.append(i)
+    return stack, in_string, escape, cuts
+
+
+def _close(text):
+    stack, in_string, escape, _ = _scan(text)
+    if in_string:
+        text = text[:-1] if escape else text
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(":"):
+        text += " null"
+    text = text.rstrip(",")
+    return strip_trailing_commas(text + "".join(CLOSERS[c] for c in reversed(stack)))
+
+
+def repair(text):
+    """Best-effort parse of a truncated JSON document; returns None if hopeless.
+
+    Open strings and containers are closed. When that is not enough (a
+    dangling key, a half-written number) the text is cut back to the
+    previous comma or opening bracket and closed again.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    text = text[start:]
+    candidates = [text]
+    cuts = _scan(text)[3]
+    candidates += [text[:cut] for cut in reversed(cuts[-REPAIR_MAX_CUTS:])]
+    for candidate in candidates:
+        try:
+            return json.loads(_close(candidate))
+        except ValueError:
+            continue
+    return None
+
+
+def _field(path):
+    """Schema field for a JSON path, accepting output without the "resume" wrapper."""
+    if path and path[0] == "resume":
+        path = path[1:]
+    if len(path) == 1 and path[0] in schema.TOP_FIELDS:
+        return path[0]
+    if len(path) == 2 and path[0] == "sections" and path[1] in schema.SECTION_FIELDS:
+        return path[1]
+    return None
+
+
+class ResumeStreamParser:
+    """Incremental parser for the LLM's parse_data JSON.
+
+    ``feed`` takes completion text as it streams in. Anything before the
+    first ``{`` (a code fence, a preamble) is skipped. Each schema field
+    (name, summary, contact and every section) is parsed and validated as
+    soon as its value closes, so by the end of the stream ``fields`` holds
+    every complete, valid field and ``errors`` the invalid ones, without
+    parsing the whole document again.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self.errors = {}
+        self.complete = False
+        self.end = None
+        # [bracket, key in parent, start index, expecting a key, last key]
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+
+    def feed(self, text):
+        if self.complete or not text:
+            return
+        if not self.buffer:
+            start = text.find("{")
+            if start < 0:
+                return
+            text = text[start:]
+        i = len(self.buffer)
+        self.buffer += text
+        while not self.complete:
+            if self._escape:  # the escaped character itself
+                if i >= len(self.buffer):
+                    break  # arrives with the next chunk
+                self._escape = False
+                i += 1
+                continue
+            match = (STRING_SPECIAL if self._in_string else STRUCTURAL).search(self.buffer, i)
+            if match is None:
+                break
+            i = match.start()
+            self._step(i, self.buffer[i])
+            i += 1
+
+    def _step(self, i, c):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                self._string_end(i)
+            return
+
+        if c == '"':
+            self._in_string = True
+            self._string_start = i
+        elif c in "{[":
+            self._stack.append([c, self._key(), i, c == "{", None])
+        elif c in "}]":
+            if not self._stack:
+                return
+            _, key, start, _, _ = self._stack.pop()
+            if not self._stack:
+                self.complete = True
+                self.end = i + 1
+            else:
+                self._value(key, start, i)
+        elif c == "," and self._stack and self._stack[-1][0] == "{":
+            self._stack[-1][3] = True
+        elif c == ":" and self._stack:
+            self._stack[-1][3] = False
+
+    def _key(self):
+        """Key the next value belongs to (None inside arrays)."""
+        if self._stack and self._stack[-1][0] == "{":
+            return self._stack[-1][4]
+        return None
+
+    def _string_end(self, end):
+        top = self._stack[-1] if self._stack else None
+        if top and top[0] == "{" and top[3]:
+            try:
+                top[4] = json.loads(self.buffer[self._string_start : end + 1])
+            except ValueError:
+                top[4] = None
+        else:
+            self._value(self._key(), self._string_start, end)
+
+    def _value(self, key, start, end):
+        field = _field([frame[1] for frame in self._stack[1:]] + [key])
+        if field is None:
+            return
+        try:
+            value = json.loads(strip_trailing_commas(self.buffer[start : end + 1]))
+            self.fields[field] = schema.validate_field(field, value)
+            self.errors.pop(field, None)
+        except ValueError as e:
+            self.errors[field] = str(e)
+
+    def partial_fields(self):
+        """Valid fields from a repaired copy of an unfinished document."""
+        document = repair(self.buffer) if self.buffer else None
+        if not isinstance(document, dict):
+            return {}
+        resume = document.get("resume", document)
+        if not isinstance(resume, dict):
+            return {}
+        sections = resume.get("sections") if isinstance(resume.get("sections"), dict) else {}
+        values = {key: resume[key] for key in schema.TOP_FIELDS if key in resume}
+        values.update({key: sections[key] for key in schema.SECTION_FIELDS if key in sections})
+
+        fields = {}
+        for field, value in values.items():
+            try:
+                fields[field] = schema.validate_field(field, value)
+            except ValueError:
+                continue
+        return fields
+
+
+def parse_completion(text):
+    """Parse a whole completion with the streaming parser."""
+    parser = ResumeStreamParser()
+    parser.feed(text)
+    return parser
+
+
+def loads(text):
+    """The first complete JSON object in ``text``, ignoring fences and trailing commas."""
+    parser = parse_completion(text)
+    if not parser.complete:
+        raise ValueError("LLM response is not a complete JSON object")
+    return json.loads(strip_trailing_commas(parser.buffer[: parser.end]))
+
+
+def repair_instruction(fields):
+    """Human-prompt lead-in asking again for only ``fields``."""
+    return (
+        f"Extract ONLY these fields from the following raw resume text: {', '.join(fields)}. "
+        "Return the same JSON format, leaving every other field empty "
+        '("" for strings, [] for arrays, {} for objects):'
+    )
+
+
+class Extraction:
+    """Collects fields over a first call and the follow-up calls for missing ones.
+
+    A field is asked for again when it was invalid, or when the response was
+    cut off before it arrived. A complete response that simply leaves a
+    field out is not retried; the field gets its empty value.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.partial = {}
+        self.pending = list(schema.FIELDS)
+        self.calls = 0
+
+    def add(self, parser):
+        wanted = set(self.pending)
+        self.calls += 1
+        self.fields.update({f: v for f, v in parser.fields.items() if f in wanted})
+        if not parser.complete:
+            for field, value in parser.partial_fields().items():
+                if field in wanted and field not in self.fields:
+                    self.partial[field] = value
+
+        self.pending = [
+            field
+            for field in schema.FIELDS
+            if field in wanted
+            and field not in self.fields
+            and (field in parser.errors or not parser.complete)
+        ]
+        if self.pending:
+            cause = "cut off" if not parser.complete else "invalid"
+            print(f"[WARN] LLM response {cause}; missing {', '.join(self.pending)}")
+
+    def next_instruction(self, default):
+        """Prompt lead-in for the next call, or None when nothing is missing."""
+        if self.calls == 0 or len(self.pending) == len(schema.FIELDS):
+            return default
+        return repair_instruction(self.pending) if self.pending else None
+
+    def result(self):
+        if not self.fields and not self.partial:
+            raise ValueError("LLM response contained no usable JSON")
+        if self.pending:
+            print(f"[WARN] Using partial or empty values for {', '.join(self.pending)}")
+        return schema.validate(schema.assemble({**self.partial, **self.fields}))
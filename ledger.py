@@ -0,0 +1,263 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from cache import file_hash
+
+# ---------------- CONFIG ----------------
+
+LEDGER_DIR = os.getenv("LEDGER_DIR", "LedgerFolder")
+LEDGER_DB = os.path.join(LEDGER_DIR, "ledger.db")
+LEDGER_MAX_ATTEMPTS = int(os.getenv("LEDGER_MAX_ATTEMPTS", "3"))
+# rows for files that disappeared are kept this long, then compacted away
+LEDGER_RETENTION_DAYS = float(os.getenv("LEDGER_RETENTION_DAYS", "30"))
+
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+MISSING = "missing"
+
+COLUMNS = (
+    "path",
+    "size",
+    "mtime_ns",
+    "content_hash",
+    "status",
+    "attempts",
+    "run_id",
+    "output_file",
+    "error",
+    "first_seen",
+    "updated_at",
+)
+
+
+def _row(row):
+    return dict(zip(COLUMNS, row)) if row else None
+
+
+class FileLedger:
+    """Durable record of every input file the watcher has handled.
+
+    Each path is stored with the size, mtime and content hash it had when it
+    was processed, plus its status. ``claim`` decides whether a file needs a
+    pipeline run: an unchanged stat means no I/O at all; a changed stat with
+    the same content hash (a touch or copy-over) only refreshes the stat.
+    Claims are made in a ``BEGIN IMMEDIATE`` transaction, so the watchdog
+    event and the startup scan cannot both enqueue the same file.
+
+    Rows left ``processing`` by an earlier run (crash, kill) belong to a
+    different ``run_id`` and are claimed again, which together with the
+    startup ``reconcile`` scan makes restarts exactly-once.
+    """
+
+    def __init__(self, path=LEDGER_DB, max_attempts=LEDGER_MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self.run_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                run_id TEXT,
+                output_file TEXT,
+                error TEXT,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS files_status ON files (status, updated_at)"
+        )
+
+    def get(self, file_path):
+        with self._lock:
+            return _row(
+                self._conn.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM files WHERE path = ?",
+                    (os.path.abspath(file_path),),
+                ).fetchone()
+            )
+
+    def _settled(self, row, size, mtime_ns, digest=None):
+        """True if ``row`` already covers this version of the file."""
+        if row is None:
+            return False
+        if digest is None and (row["size"], row["mtime_ns"]) != (size, mtime_ns):
+            return False
+        if digest is not None and row["content_hash"] != digest:
+            return False
+        if row["status"] == DONE:
+            return True
+        if row["status"] == PROCESSING:
+            return row["run_id"] == self.run_id  # in flight in this run
+        if row["status"] == FAILED:
+            return row["attempts"] >= self.max_attempts
+        return False
+
+    def claim(self, file_path):
+        """Mark ``file_path`` as processing if it needs a run; returns True if so."""
+        path = os.path.abspath(file_path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+
+        row = self.get(path)
+        if self._settled(row, st.st_size, st.st_mtime_ns):
+            return False
+
+        digest = file_hash(path)  # hashed outside the lock; re-checked below
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = _row(
+                    self._conn.execute(
+                        f"SELECT {', '.join(COLUMNS)} FROM files WHERE path = ?", (path,)
+                    ).fetchone()
+                )
+                if self._settled(row, st.st_size, st.st_mtime_ns, digest):
+                    # same content under a new stat (touch, copy-over): remember the stat
+                    self._conn.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ?, updated_at = ? WHERE path = ?",
+                        (st.st_size, st.st_mtime_ns, now, path),
+                    )
+                    self._conn.execute("COMMIT")
+                    return False
+
+                attempts = row["attempts"] + 1 if row and row["content_hash"] == digest else 1
+                self._conn.execute(
+                    """
+                    INSERT INTO files (path, size, mtime_ns, content_hash, status, attempts,
+                                       run_id, first_seen, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (path) DO UPDATE SET
+                        size = excluded.size, mtime_ns = excluded.mtime_ns,
+                        content_hash = excluded.content_hash, status = excluded.status,
+                        attempts = excluded.attempts, run_id = excluded.run_id,
+                        output_file = NULL, error = NULL, updated_at = excluded.updated_at
+                    """,
+                    (path, st.st_size, st.st_mtime_ns, digest, PROCESSING, attempts, self.run_id, now, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def _finish(self, file_path, status, output_file=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET status = ?, output_file = ?, error = ?, updated_at = ? "
+                "WHERE path = ?",
+                (status, output_file, error, time.time(), os.path.abspath(file_path)),
+            )
+
+    def mark_done(self, file_path, output_file=None):
+        self._finish(file_path, DONE, output_file=output_file)
+
+    def mark_failed(self, file_path, error):
+        self._finish(file_path, FAILED, error=error)
+
+    def needs_run(self, file_path):
+        """Cheap stat-only check: could ``claim`` return True for this file?"""
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+        return not self._settled(self.get(file_path), st.st_size, st.st_mtime_ns)
+
+    def reconcile(self, directory, extensions, claim=True):
+        """Startup scan: find files that are new, changed or unfinished.
+
+        With ``claim`` they are claimed and returned (to be enqueued);
+        without it they are only returned, for a caller that claims them
+        later (automate.py waits until each file is completely written).
+        Rows for files that no longer exist in ``directory`` are marked missing.
+        """
+        directory = os.path.abspath(directory)
+        claimed, seen = [], set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(extensions):
+                    continue
+                seen.add(entry.path)
+                if self.claim(entry.path) if claim else self.needs_run(entry.path):
+                    claimed.append(entry.path)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE status != ? AND path LIKE ?",
+                (MISSING, os.path.join(directory, "%")),
+            ).fetchall()
+            gone = [
+                (time.time(), path)
+                for (path,) in rows
+                if os.path.dirname(path) == directory
+                and path not in seen
+                and not os.path.exists(path)
+            ]
+            self._conn.executemany(
+                f"UPDATE files SET status = '{MISSING}', updated_at = ? WHERE path = ?", gone
+            )
+        print(
+            f"[INFO] Ledger reconcile of {directory}: {len(seen)} file(s), "
+            f"{len(claimed)} to process, {len(gone)} missing"
+        )
+        return claimed
+
+    def compact(self, retention_days=LEDGER_RETENTION_DAYS):
+        """Drop rows for files that have been gone longer than the retention period."""
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM files WHERE status = ? AND updated_at < ?", (MISSING, cutoff)
+            )
+        if cursor.rowcount:
+            print(f"[INFO] Ledger compacted {cursor.rowcount} row(s)")
+        return cursor.rowcount
+
+    def search(self, query="", status=None, limit=50, offset=0):
+        """Rows whose path contains ``query``, newest first.
+
+        Returns ``(rows, total)`` where ``total`` counts every match, for paging.
+        """
+        where, params = ["path LIKE ? ESCAPE '\\'"], []
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        clause = " AND ".join(where)
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM files WHERE {clause}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM files WHERE {clause} "
+                "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [_row(row) for row in rows], total
+
+    def counts(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM files GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
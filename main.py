@@ -1,3 +1,4 @@
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, white
@@ -8,12 +9,19 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
+import io
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 import os
 
 styles = getSampleStyleSheet()
 
+# part of the rendered-PDF cache key; bump when the layout changes
+RENDER_VERSION = "1"
+
 TEXT = HexColor("#091448")
 HEADER_CONTENT_TOP_OFFSET = 35
 
@@ -38,11 +46,17 @@ CELL_STYLE = ParagraphStyle(
     wordWrap="CJK",       # 🔴 CRITICAL FIX
 )
 
-def header_cell(text):
-    return Paragraph(text, HEADER_STYLE)
+CELL_BOLD_STYLE = ParagraphStyle(
+    "CellBoldStyle",
+    parent=CELL_STYLE,
+    fontName="Helvetica-Bold",
+)
+
+def header_cell(text, style=HEADER_STYLE):
+    return Paragraph(text, style)
 
-def body_cell(text):
-    return Paragraph(text if text else "", CELL_STYLE)
+def body_cell(text, style=CELL_STYLE):
+    return Paragraph(text if text else "", style)
 
 
 
@@ -53,6 +67,33 @@ logging.basicConfig(
 
 logger = logging.getLogger("resume_pdf_generator")
 
+_A85_LOCK = threading.Lock()
+_a85_renders = 0
+_a85_previous = None
+
+
+@contextmanager
+def _binary_streams():
+    """Write binary (not ASCII85) streams while a resume renders.
+
+    The pure-Python A85 encoder dominated render time for the logo/icon
+    images and inflated the output by ~20%. reportlab only has the global
+    ``rl_config.useA85``, so it is switched off for the duration of our
+    renders and restored when the last concurrent one finishes.
+    """
+    global _a85_renders, _a85_previous
+    with _A85_LOCK:
+        if _a85_renders == 0:
+            _a85_previous, rl_config.useA85 = rl_config.useA85, 0
+        _a85_renders += 1
+    try:
+        yield
+    finally:
+        with _A85_LOCK:
+            _a85_renders -= 1
+            if _a85_renders == 0:
+                rl_config.useA85 = _a85_previous
+
 
 
 
@@ -71,7 +112,6 @@ FIRST_PAGE_HEADER_HEIGHT = 80
 FIRST_PAGE_HEADER_WITH_CONTACT = 90
 FIRST_PAGE_HEADER_NO_CONTACT = 70
 OTHER_PAGE_HEADER_HEIGHT = 60
-CURRENT_PAGE = 1
 
 LOGO_X_FIRST_PAGE = LEFT_MARGIN - 30  # current position
 LOGO_X_OTHER_PAGES = 20  # more left (near page edge)
@@ -88,12 +128,9 @@ TABLE_BG = HexColor("#F7F9FC")
 
 
 def cell(text, bold=False):
-    style = styles["Normal"]
-    style.fontName = "Helvetica-Bold" if bold else "Helvetica"
-    style.fontSize = 9
-    style.leading = 11
-    style.wordWrap = "CJK"  # IMPORTANT: forces wrapping
-    return Paragraph(text, style)
+    # Uses dedicated styles; mutating styles["Normal"] here leaked fonts
+    # between concurrently rendered documents.
+    return Paragraph(text, CELL_BOLD_STYLE if bold else CELL_STYLE)
 
 
 def output_path(name):
@@ -102,6 +139,15 @@ def output_path(name):
     return f"OutputFolder/{name.replace(' ', '_')}_{ts}.pdf"
 
 
+@lru_cache(maxsize=None)
+def load_image(path):
+    """Decode an image once per process; None if the file is missing."""
+    if not os.path.exists(path):
+        logger.warning(f"Image not found, drawing without it: {path}")
+        return None
+    return ImageReader(path)
+
+
 def extract_handle(url):
     if not url or url.lower() == "none":
         return None
@@ -123,14 +169,16 @@ def draw_icon_text(c, icon_path, text, start_x, center_y, font="Helvetica", size
     # Text baseline adjusted to visual center
     text_y = center_y - size * 0.3
 
-    c.drawImage(
-        icon_path,
-        start_x,
-        icon_y,
-        ICON_SIZE,
-        ICON_SIZE,
-        mask="auto",
-    )
+    icon = load_image(icon_path)
+    if icon is not None:
+        c.drawImage(
+            icon,
+            start_x,
+            icon_y,
+            ICON_SIZE,
+            ICON_SIZE,
+            mask="auto",
+        )
 
     c.setFont(font, size)
     c.drawString(
@@ -163,8 +211,8 @@ def draw_header(c, name, contact, page_no, logo_path="refernce/logoWhite.png"):
     # Logo position based on page
     logo_x = LOGO_X_FIRST_PAGE if is_first_page else LOGO_X_OTHER_PAGES
 
-    if os.path.exists(logo_path):
-        logo = ImageReader(logo_path)
+    logo = load_image(logo_path)
+    if logo is not None:
         c.drawImage(
             logo,
             logo_x,
@@ -313,23 +361,41 @@ def draw_header(c, name, contact, page_no, logo_path="refernce/logoWhite.png"):
     return header_height
 
 
-def start_new_page(c, name, contact):
-    global CURRENT_PAGE
-    CURRENT_PAGE += 1
+class RenderContext:
+    """Everything one document render mutates: canvas, page number, header data
+    and paragraph styles. Nothing is shared between documents, so separate
+    threads can render separate resumes at the same time."""
+
+    def __init__(self, c, name, contact):
+        self.canvas = c
+        self.name = name
+        self.contact = contact
+        self.page = 1
+        self.styles = {
+            "header": HEADER_STYLE,
+            "cell": CELL_STYLE,
+            "cell_bold": CELL_BOLD_STYLE,
+        }
+
+
+def start_new_page(ctx):
+    c = ctx.canvas
+    ctx.page += 1
     c.showPage()
 
-    header_height = draw_header(c, name, contact, CURRENT_PAGE)
+    header_height = draw_header(c, ctx.name, ctx.contact, ctx.page)
     return PAGE_HEIGHT - header_height - 30
 
 
-def draw_text(c, text, x, y, max_width, name, contact, size=10, bold=False):
+def draw_text(ctx, text, x, y, max_width, size=10, bold=False):
+    c = ctx.canvas
     font = "Helvetica-Bold" if bold else "Helvetica"
     c.setFont(font, size)
     c.setFillColor(TEXT)
 
     for line in simpleSplit(text, font, size, max_width):
         if y < BOTTOM_MARGIN:
-            y = start_new_page(c, name, contact)
+            y = start_new_page(ctx)
             c.setFont(font, size)
             c.setFillColor(TEXT)
         c.drawString(x, y, line)
@@ -337,12 +403,13 @@ def draw_text(c, text, x, y, max_width, name, contact, size=10, bold=False):
     return y
 
 
-def draw_bullet(c, text, y, name, contact):
+def draw_bullet(ctx, text, y):
+    c = ctx.canvas
     lines = simpleSplit(text, "Helvetica", 10, RIGHT_MARGIN - LEFT_MARGIN - 14)
     required = len(lines) * LINE_HEIGHT
 
     if y - required < BOTTOM_MARGIN:
-        y = start_new_page(c, name, contact)
+        y = start_new_page(ctx)
 
     c.setFont("Helvetica-Bold", 10)
     c.drawString(LEFT_MARGIN, y, "•")
@@ -354,10 +421,11 @@ def draw_bullet(c, text, y, name, contact):
     return y
 
 
-def section_title(c, title, y, name, contact):
+def section_title(ctx, title, y):
+    c = ctx.canvas
     y -= SPACE_BEFORE_SECTION
     if y < BOTTOM_MARGIN + 30:
-        y = start_new_page(c, name, contact)
+        y = start_new_page(ctx)
 
     c.setFont("Helvetica-Bold", 12)
     c.setFillColor(SECTION)
@@ -370,13 +438,15 @@ def section_title(c, title, y, name, contact):
 # ---------------- SKILLSET ----------------
 
 
-def draw_skillset_table(c, skillset, y, name, contact):
+def draw_skillset_table(ctx, skillset, y):
+    c = ctx.canvas
+    header_style, cell_style = ctx.styles["header"], ctx.styles["cell"]
     # ---------------- HEADER ROW ----------------
     table_data = [
         [
-            header_cell("Domain"),
-            header_cell("Category"),
-            header_cell("Skills"),
+            header_cell("Domain", header_style),
+            header_cell("Category", header_style),
+            header_cell("Skills", header_style),
         ]
     ]
 
@@ -387,9 +457,9 @@ def draw_skillset_table(c, skillset, y, name, contact):
         if isinstance(domain_data, list):
             if domain_data:
                 table_data.append([
-                    body_cell(domain),
-                    body_cell(""),
-                    body_cell(", ".join(domain_data)),
+                    body_cell(domain, cell_style),
+                    body_cell("", cell_style),
+                    body_cell(", ".join(domain_data), cell_style),
                 ])
             continue
 
@@ -403,18 +473,18 @@ def draw_skillset_table(c, skillset, y, name, contact):
                 for subcat, subvals in values.items():
                     if subvals:
                         table_data.append([
-                            body_cell(domain if first_row else ""),
-                            body_cell(f"{category} ({subcat})"),
-                            body_cell(", ".join(subvals)),
+                            body_cell(domain if first_row else "", cell_style),
+                            body_cell(f"{category} ({subcat})", cell_style),
+                            body_cell(", ".join(subvals), cell_style),
                         ])
                         first_row = False
 
             # Normal list
             elif isinstance(values, list) and values:
                 table_data.append([
-                    body_cell(domain if first_row else ""),
-                    body_cell(category),
-                    body_cell(", ".join(values)),
+                    body_cell(domain if first_row else "", cell_style),
+                    body_cell(category, cell_style),
+                    body_cell(", ".join(values), cell_style),
                 ])
                 first_row = False
 
@@ -456,7 +526,7 @@ def draw_skillset_table(c, skillset, y, name, contact):
     height = table._height
 
     if y - height < BOTTOM_MARGIN:
-        y = start_new_page(c, name, contact)
+        y = start_new_page(ctx)
 
     table.drawOn(c, LEFT_MARGIN, y - height)
 
@@ -464,58 +534,52 @@ def draw_skillset_table(c, skillset, y, name, contact):
 
 
 
-def draw_professional_history(c, history, y, name, contact):
-    y = section_title(c, "Employment History", y, name, contact)
+def draw_professional_history(ctx, history, y):
+    y = section_title(ctx, "Employment History", y)
 
     for job in history:
         # Job title and company
         title_company = f"{job['title']} at {job['company']}"
         y = draw_text(
-            c,
+            ctx,
             title_company,
             LEFT_MARGIN,
             y,
             RIGHT_MARGIN - LEFT_MARGIN,
-            name,
-            contact,
             bold=True,
         )
 
         if job.get("timespan"):
             y -= 2
             y = draw_text(
-                c,
+                ctx,
                 job["timespan"],
                 LEFT_MARGIN,
                 y,
                 RIGHT_MARGIN - LEFT_MARGIN,
-                name,
-                contact,
                 size=9.3,
             )
         y -= 3
 
         # Job points
         for point in job.get("points", []):
-            y = draw_bullet(c, point, y, name, contact)
+            y = draw_bullet(ctx, point, y)
 
         y -= 8
 
     return y
 
 
-def draw_projects(c, projects, y, name, contact):
-    y = section_title(c, "Project Showcase", y, name, contact)
+def draw_projects(ctx, projects, y):
+    y = section_title(ctx, "Project Showcase", y)
 
     for project in projects:
         y = draw_text(
-            c,
+            ctx,
             project["title"],
             LEFT_MARGIN,
             y,
             RIGHT_MARGIN - LEFT_MARGIN,
-            name,
-            contact,
             bold=True,
         )
 
@@ -523,19 +587,17 @@ def draw_projects(c, projects, y, name, contact):
         if tech:
             y -= 2
             y = draw_text(
-                c,
+                ctx,
                 f"Technologies: {tech}",
                 LEFT_MARGIN,
                 y,
                 RIGHT_MARGIN - LEFT_MARGIN,
-                name,
-                contact,
                 size=9.3,
             )
         y-=3
 
         for point in project.get("points", []):
-            y = draw_bullet(c, point, y, name, contact)
+            y = draw_bullet(ctx, point, y)
 
         y -= 8
 
@@ -545,24 +607,28 @@ def draw_projects(c, projects, y, name, contact):
 # ---------------- MAIN ----------------
 
 
-def generate_resume_pdf(state, show_contact=True):
-    logger.info("Starting PDF generation")
+@_binary_streams()
+def generate_resume_pdf(state, show_contact=True, output_file=None):
+    """Render ``state`` to ``output_file`` and return it.
 
-    global CURRENT_PAGE
-    CURRENT_PAGE = 1  # must be reset at start
-    logger.debug("Initialized CURRENT_PAGE = 1")
+    ``output_file`` may be a path or any writable binary buffer; when omitted a
+    timestamped file under OutputFolder is created.
+    """
+    logger.info("Starting PDF generation")
 
     resume = state.get("resume", {})
     name = resume.get("name", "Unknown")
     contact = resume.get("contact", {}) if show_contact else None
 
-    output_file = output_path(name)
+    if output_file is None:
+        output_file = output_path(name)
     logger.info(f"Output PDF path resolved: {output_file}")
 
     try:
         c = canvas.Canvas(output_file, pagesize=A4)
+        ctx = RenderContext(c, name, contact)
 
-        header_height = draw_header(c, name, contact, CURRENT_PAGE)
+        header_height = draw_header(c, name, contact, ctx.page)
         y = PAGE_HEIGHT - header_height - 30
 
         logger.debug(f"Header drawn, starting Y position: {y}")
@@ -572,15 +638,13 @@ def generate_resume_pdf(state, show_contact=True):
         if summary:
             logger.info("Rendering Objectives section")
             y += 20
-            y = section_title(c, "Objectives", y, name, contact)
+            y = section_title(ctx, "Objectives", y)
             y = draw_text(
-                c,
+                ctx,
                 summary,
                 LEFT_MARGIN,
                 y,
                 RIGHT_MARGIN - LEFT_MARGIN,
-                name,
-                contact,
             )
             y -= 10
         else:
@@ -590,10 +654,10 @@ def generate_resume_pdf(state, show_contact=True):
         career = resume.get("sections", {}).get("Career Summary", [])
         if career:
             logger.info("Rendering Career Summary section")
-            y = section_title(c, "Career Summary", y, name, contact)
+            y = section_title(ctx, "Career Summary", y)
             for idx, point in enumerate(career, start=1):
                 logger.debug(f"Career bullet {idx}: {point[:60]}...")
-                y = draw_bullet(c, point, y, name, contact)
+                y = draw_bullet(ctx, point, y)
         else:
             logger.debug("No Career Summary data found")
 
@@ -601,8 +665,8 @@ def generate_resume_pdf(state, show_contact=True):
         skills = resume.get("sections", {}).get("Skillset", {})
         if skills:
             logger.info("Rendering Skillset section")
-            y = section_title(c, "Skillset", y, name, contact)
-            y = draw_skillset_table(c, skills, y, name, contact)
+            y = section_title(ctx, "Skillset", y)
+            y = draw_skillset_table(ctx, skills, y)
         else:
             logger.debug("No Skillset data found")
 
@@ -612,9 +676,7 @@ def generate_resume_pdf(state, show_contact=True):
         )
         if professional_history:
             logger.info("Rendering Professional History section")
-            y = draw_professional_history(
-                c, professional_history, y, name, contact
-            )
+            y = draw_professional_history(ctx, professional_history, y)
         else:
             logger.debug("No Professional History found")
 
@@ -622,7 +684,7 @@ def generate_resume_pdf(state, show_contact=True):
         projects = resume.get("sections", {}).get("Project Showcase", [])
         if projects:
             logger.info(f"Rendering {len(projects)} project(s)")
-            y = draw_projects(c, projects, y, name, contact)
+            y = draw_projects(ctx, projects, y)
         else:
             logger.debug("No projects found")
 
@@ -630,9 +692,9 @@ def generate_resume_pdf(state, show_contact=True):
         education = resume.get("sections", {}).get("Education", [])
         if education:
             logger.info("Rendering Education section")
-            y = section_title(c, "Education", y, name, contact)
+            y = section_title(ctx, "Education", y)
             for edu in education:
-                y = draw_bullet(c, edu, y, name, contact)
+                y = draw_bullet(ctx, edu, y)
         else:
             logger.debug("No Education data found")
 
@@ -646,6 +708,13 @@ def generate_resume_pdf(state, show_contact=True):
         raise
 
 
+def render_resume_bytes(state, show_contact=True):
+    """Render ``state`` in memory and return the PDF bytes (no disk round trip)."""
+    buffer = io.BytesIO()
+    generate_resume_pdf(state, show_contact=show_contact, output_file=buffer)
+    return buffer.getvalue()
+
+
 
 
 
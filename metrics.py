@@ -0,0 +1,319 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ---------------- CONFIG ----------------
+
+METRICS_LOG = os.getenv("METRICS_LOG", os.path.join("LogFolder", "jobs.jsonl"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+# ---------------- PRIMITIVES ----------------
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time.
+
+    With ``label`` the callback returns ``{label_value: number}``.
+    """
+
+    def __init__(self, name, help_text, callback, label=None):
+        self.name, self.help, self.callback, self.label = name, help_text, callback, label
+
+    def render(self):
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        if self.label is None:
+            lines.append(f"{self.name} {value}")
+        else:
+            for label_value, number in sorted(value.items()):
+                lines.append(f"{self.name}{_labels((self.label,), (label_value,))} {number}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            idx = bisect.bisect_left(self.buckets, value)
+            if idx < len(self.buckets):
+                series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f"{self.name}_bucket{_labels(self.labels + ('le',), values + (bound,))} {cumulative}"
+                    )
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labels + ('le',), values + ('+Inf',))} {count}"
+                )
+                lines.append(f"{self.name}_sum{_labels(self.labels, values)} {round(total, 6)}")
+                lines.append(f"{self.name}_count{_labels(self.labels, values)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics = [m for m in self._metrics if m.name != metric.name]
+            self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, callback, label=None):
+        return self.register(Gauge(name, help_text, callback, label))
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram("resume_stage_seconds", "Latency of each pipeline stage", ["stage"])
+)
+STAGE_BYTES_IN = REGISTRY.register(
+    Counter("resume_stage_bytes_in_total", "Bytes consumed by each stage", ["stage"])
+)
+STAGE_BYTES_OUT = REGISTRY.register(
+    Counter("resume_stage_bytes_out_total", "Bytes produced by each stage", ["stage"])
+)
+STAGE_FAILURES = REGISTRY.register(
+    Counter("resume_stage_failures_total", "Stage failures", ["stage"])
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter("resume_llm_tokens_total", "LLM tokens reported by the provider", ["kind"])
+)
+COMPACTION_TOKENS = REGISTRY.register(
+    Counter(
+        "resume_compaction_tokens_total",
+        "Estimated resume tokens before and after compaction",
+        ["phase"],
+    )
+)
+LLM_CALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "resume_llm_call_seconds",
+        "Latency of each LLM request by provider prompt-cache result",
+        ["cache"],
+    )
+)
+HEURISTIC = REGISTRY.register(
+    Counter(
+        "resume_heuristic_total",
+        "Resumes structured by the rule-based extractor (accepted) or sent to the LLM",
+        ["result"],
+    )
+)
+JOB_SECONDS = REGISTRY.register(
+    Histogram("resume_job_seconds", "End-to-end latency per resume")
+)
+JOBS = REGISTRY.register(Counter("resume_jobs_total", "Finished resumes", ["status"]))
+
+
+# ---------------- PER-JOB COLLECTION ----------------
+#
+# Stages may run in other processes (dispatcher process pools, workers), so
+# nodes write their measurements into ``state["metrics"]``; whoever finishes
+# the job calls ``record_job`` to fold them into this process's registry and
+# the JSON job log.
+
+
+def stage_metrics(state, stage, seconds, bytes_in=0, bytes_out=0):
+    state.setdefault("metrics", {}).setdefault("stages", {})[stage] = {
+        "seconds": round(seconds, 4),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+    }
+
+
+def llm_usage(state, *responses, share=1.0):
+    """Add provider-reported tokens to the job's totals.
+
+    A job may be billed more than once (a failed batch, then its fallback
+    call). ``share`` is the job's fraction of responses shared with other
+    jobs (batched requests).
+    """
+    tokens = state.setdefault("metrics", {}).setdefault("llm_tokens", {"input": 0, "output": 0})
+    for response in responses:
+        usage = getattr(response, "usage_metadata", None) or {}
+        tokens["input"] += round(usage.get("input_tokens", 0) * share)
+        tokens["output"] += round(usage.get("output_tokens", 0) * share)
+
+
+def llm_call(state, response, seconds):
+    """Record one LLM request: latency and whether the provider's prompt cache hit."""
+    from prompts import cached_tokens
+
+    cached = cached_tokens(response)
+    state.setdefault("metrics", {}).setdefault("llm_calls", []).append(
+        {
+            "seconds": round(seconds, 4),
+            "cached_tokens": cached,
+            "cache": "hit" if cached else "miss",
+        }
+    )
+
+
+def compaction_usage(state, stats):
+    state.setdefault("metrics", {})["compaction"] = stats
+
+
+def heuristic_result(state, stats, accepted):
+    state.setdefault("metrics", {})["heuristic"] = {**stats, "accepted": accepted}
+
+
+def _measure(fn, value):
+    if fn is None:
+        return 0
+    try:
+        return fn(value)
+    except Exception:
+        return 0
+
+
+def timed_node(stage, bytes_in=None, bytes_out=None):
+    """Decorate a graph node to record its latency and byte sizes in the state."""
+
+    def wrap(node):
+        @functools.wraps(node)
+        def timed(state):
+            size_in = _measure(bytes_in, state)
+            started = time.perf_counter()
+            result = node(state)
+            if isinstance(result, dict):
+                stage_metrics(
+                    result, stage, time.perf_counter() - started, size_in, _measure(bytes_out, result)
+                )
+            return result
+
+        return timed
+
+    return wrap
+
+
+_LOG_LOCK = threading.Lock()
+
+
+def record_job(job_metrics, status, source, total_seconds=None, error=None, failed_stage=None, **fields):
+    """Fold one job's metrics into the registry and append a JSON log line."""
+    job_metrics = job_metrics or {}
+    for stage, values in job_metrics.get("stages", {}).items():
+        STAGE_SECONDS.observe(values["seconds"], stage)
+        STAGE_BYTES_IN.inc(values["bytes_in"], stage)
+        STAGE_BYTES_OUT.inc(values["bytes_out"], stage)
+    for kind, count in job_metrics.get("llm_tokens", {}).items():
+        LLM_TOKENS.inc(count, kind)
+    for call in job_metrics.get("llm_calls", []):
+        LLM_CALL_SECONDS.observe(call["seconds"], call["cache"])
+        LLM_TOKENS.inc(call["cached_tokens"], "cached")
+    compaction = job_metrics.get("compaction")
+    if compaction:
+        COMPACTION_TOKENS.inc(compaction["tokens_before"], "before")
+        COMPACTION_TOKENS.inc(compaction["tokens_after"], "after")
+    heuristic = job_metrics.get("heuristic")
+    if heuristic:
+        HEURISTIC.inc(1, "accepted" if heuristic["accepted"] else "llm")
+    if failed_stage:
+        STAGE_FAILURES.inc(1, failed_stage)
+    if total_seconds is not None:
+        JOB_SECONDS.observe(total_seconds)
+    JOBS.inc(1, status)
+
+    record = {
+        "ts": time.time(),
+        "source": source,
+        "status": status,
+        "total_seconds": total_seconds,
+        "error": error,
+        **fields,
+        **job_metrics,
+    }
+    try:
+        os.makedirs(os.path.dirname(METRICS_LOG) or ".", exist_ok=True)
+        with _LOG_LOCK, open(METRICS_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+    except OSError as e:
+        print(f"[WARN] Could not write job log {METRICS_LOG}: {e}")
+
+
+# ---------------- EXPOSITION ----------------
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port, host="0.0.0.0"):
+    """Expose /metrics from a background thread (for automate.py / worker.py)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    print(f"[INFO] Metrics on http://{host}:{port}/metrics")
+    return server
@@ -1,31 +1,219 @@
+import argparse
 import hashlib
 import os
-from agent import get_response
-FILE_HASHES = {}  # persists in-memory while process runs
+import sqlite3
+import threading
+import time
 
-def get_file_hash(path):
-    hasher = hashlib.md5()
+try:  # optional: xxh3 hashes several times faster than any hashlib algorithm
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# ---------------- CONFIG ----------------
+
+INPUT_DIR = os.getenv("PERIODIC_INPUT_DIR", "ResumeFolder")
+VALID_EXTS = (".pdf", ".docx")
+PERIODIC_INTERVAL = float(os.getenv("PERIODIC_INTERVAL", "60"))
+# a failing file is retried on this many scans, then left alone until it changes
+PERIODIC_MAX_ATTEMPTS = int(os.getenv("PERIODIC_MAX_ATTEMPTS", "3"))
+PERIODIC_INDEX = os.getenv("PERIODIC_INDEX", os.path.join("LedgerFolder", "scan_index.db"))
+# xxh3_128 when xxhash is installed, else blake2b; any hashlib name also works
+# (sha256 is fastest on CPUs with SHA extensions).
+PERIODIC_HASH = os.getenv("PERIODIC_HASH", "xxh3_128" if xxhash else "blake2b")
+if PERIODIC_HASH.startswith("xxh") and xxhash is None:
+    print(f"[WARN] PERIODIC_HASH={PERIODIC_HASH} needs xxhash, using blake2b")
+    PERIODIC_HASH = "blake2b"
+
+
+def _hasher(algorithm):
+    if algorithm.startswith("xxh"):
+        return getattr(xxhash, algorithm)()
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=20)
+    return hashlib.new(algorithm)
+
+
+def get_file_hash(path, algorithm=PERIODIC_HASH):
+    """``"<algorithm>:<hex digest>"`` of a file, read in 1 MB chunks.
+
+    The algorithm is part of the digest so an index written with another
+    PERIODIC_HASH can still be compared.
+    """
+    hasher = _hasher(algorithm)
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
             hasher.update(chunk)
-    return hasher.hexdigest()
+    return f"{algorithm}:{hasher.hexdigest()}"
 
 
-def periodic_scan():
-    print("[SCHEDULER] Scanning folder for changes")
+class ScanIndex:
+    """Persisted ``path -> (size, mtime_ns, inode, digest, status, attempts)`` of the last scan.
+
+    ``attempts`` counts consecutive failures of a file with the same stat key.
+    """
+
+    def __init__(self, path=PERIODIC_INDEX):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                status TEXT NOT NULL,
+                scanned_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "attempts" not in columns:  # index written before retries were capped
+            self._conn.execute("ALTER TABLE files ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def load(self, directory):
+        """Index rows for ``directory`` as ``{path: (size, mtime_ns, inode, digest, status, attempts)}``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, inode, digest, status, attempts FROM files"
+            ).fetchall()
+        return {
+            path: tuple(rest)
+            for path, *rest in rows
+            if os.path.dirname(path) == directory
+        }
+
+    def save(self, path, stat_key, digest, status, attempts=0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files "
+                "(path, size, mtime_ns, inode, digest, status, scanned_at, attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, *stat_key, digest, status, time.time(), attempts),
+            )
+            self._conn.commit()
+
+    def remove(self, paths):
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+            self._conn.commit()
+
 
-    for filename in os.listdir(INPUT_DIR):
-        path = os.path.join(INPUT_DIR, filename)
+def _stat_key(entry):
+    st = entry.stat()
+    return st.st_size, st.st_mtime_ns, entry.inode()
 
-        if not path.lower().endswith((".pdf", ".docx", ".jpg")):
-            continue
 
-        current_hash = get_file_hash(path)
-        previous_hash = FILE_HASHES.get(path)
+def periodic_scan(input_dir=INPUT_DIR, index=None, process=None):
+    """Process files that changed since the last scan.
+
+    Only ``os.scandir`` metadata is read for unchanged files; a file is
+    hashed only when its size, mtime or inode differ from the index, and it
+    is processed only when the hash differs too. A failed file is retried
+    on the next PERIODIC_MAX_ATTEMPTS - 1 scans and then skipped until its
+    stat changes. The cost of a tick is therefore the directory listing
+    plus the changed (and still retrying) files.
+    """
+    if index is None:
+        index = ScanIndex()
+    if process is None:
+        from agent import get_response as process
+
+    print("[SCHEDULER] Scanning folder for changes")
+    started = time.perf_counter()
+    directory = os.path.abspath(input_dir)
+    known = index.load(directory)
+    seen, hashed, processed = set(), 0, 0
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(VALID_EXTS):
+                continue
+            path = entry.path
+            seen.add(path)
+            stat_key = _stat_key(entry)
+            previous = known.get(path)
+            # failures are retried on later scans, up to PERIODIC_MAX_ATTEMPTS
+            # while the file stays the same
+            attempts = previous[5] if previous and previous[:3] == stat_key else 0
+            if previous and previous[:3] == stat_key:
+                if previous[4] != "failed" or attempts >= PERIODIC_MAX_ATTEMPTS:
+                    continue
+
+            # compare with the algorithm the index entry was written with,
+            # unless it was xxhash and xxhash is no longer installed
+            algorithm = previous[3].split(":", 1)[0] if previous else PERIODIC_HASH
+            if algorithm.startswith("xxh") and xxhash is None:
+                algorithm = PERIODIC_HASH
+            current_hash = get_file_hash(path, algorithm)
+            hashed += 1
+            if previous and previous[4] != "failed" and previous[3] == current_hash:
+                index.save(path, stat_key, current_hash, "unchanged")  # touched, same bytes
+                continue
+            if algorithm != PERIODIC_HASH:
+                current_hash = get_file_hash(path)
 
-        if current_hash != previous_hash:
-            FILE_HASHES[path] = current_hash
             print(f"[CHANGE DETECTED] {path}")
-            get_response(path)
+            result = process(path)
+            processed += 1
+            if str(result).startswith("Error"):
+                attempts += 1
+                index.save(path, stat_key, current_hash, "failed", attempts)
+                if attempts >= PERIODIC_MAX_ATTEMPTS:
+                    print(f"[WARN] Giving up on {path} after {attempts} attempts until it changes")
+            else:
+                index.save(path, stat_key, current_hash, "done")
+
+    removed = [path for path in known if path not in seen]
+    if removed:
+        index.remove(removed)
+
+    summary = {
+        "files": len(seen),
+        "hashed": hashed,
+        "processed": processed,
+        "removed": len(removed),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    print(f"[SCHEDULER] Scan done: {summary}")
+    return summary
+
+
+def run_forever(interval=PERIODIC_INTERVAL, input_dir=INPUT_DIR):
+    """Scan every ``interval`` seconds, measured from the start of each scan."""
+    index = ScanIndex()
+    print(f"[SCHEDULER] Scanning {input_dir} every {interval:.0f}s")
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                periodic_scan(input_dir, index)
+            except Exception as e:
+                print(f"[ERROR] Scan failed: {e}")
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("[SCHEDULER] Stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Periodic ResumeFolder scanner")
+    parser.add_argument("--input-dir", default=INPUT_DIR)
+    parser.add_argument("--interval", type=float, default=PERIODIC_INTERVAL, help="Seconds between scans")
+    parser.add_argument("--once", action="store_true", help="Run a single scan and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        periodic_scan(args.input_dir)
+    else:
+        run_forever(args.interval, args.input_dir)
+
 
-periodic_scan()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import random
+import time
+
+# ---------------- CONFIG ----------------
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+LLM_RPM = float(os.getenv("LLM_RPM", "30"))
+LLM_TPM = float(os.getenv("LLM_TPM", "12000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "6"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60.0"))
+# completion budget assumed up front; corrected (charged or refunded) from usage afterwards
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "1500"))
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) used for budgeting."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute`` tokens/minute.
+
+    ``debit`` corrects a reservation once the real cost is known: a positive
+    amount may push the balance negative (later ``acquire`` calls then wait
+    it out), a negative one refunds an over-reservation.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def debit(self, amount):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def is_rate_limited(exc):
+    if 429 in (getattr(exc, "status_code", None), getattr(exc, "code", None)):
+        return True
+    return type(exc).__name__ == "RateLimitError"
+
+
+def retry_after(exc):
+    """Seconds from a Retry-After header on the provider error, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Keeps up to ``max_concurrency`` LLM calls in flight within RPM/TPM budgets.
+
+    Calls that fail with HTTP 429 are retried with exponential backoff and
+    full jitter (honouring Retry-After when the provider sends it); other
+    errors are raised immediately.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=LLM_CONCURRENCY,
+        rpm=LLM_RPM,
+        tpm=LLM_TPM,
+        max_retries=LLM_MAX_RETRIES,
+        backoff_base=LLM_BACKOFF_BASE,
+        backoff_max=LLM_BACKOFF_MAX,
+    ):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+
+    def backoff(self, attempt, exc=None):
+        delay = min(self.backoff_max, self.backoff_base * (2**attempt))
+        delay = random.uniform(0, delay)
+        hinted = retry_after(exc) if exc is not None else None
+        return max(delay, hinted) if hinted else delay
+
+    async def run(self, call, estimated_tokens):
+        """Await ``call()`` (a coroutine factory) under the budgets.
+
+        The concurrency slot is released while backing off after a 429, so
+        other calls are not blocked by a sleeping retry.
+        """
+        for attempt in range(self.max_retries + 1):
+            async with self.semaphore:
+                await self.requests.acquire(1)
+                await self.tokens.acquire(estimated_tokens)
+                try:
+                    response = await call()
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    error = e
+                else:
+                    usage = getattr(response, "usage_metadata", None) or {}
+                    used = usage.get("total_tokens")
+                    if used:
+                        self.tokens.debit(used - estimated_tokens)
+                    return response
+
+            delay = self.backoff(attempt, error)
+            self.retries += 1
+            print(f"[WARN] LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
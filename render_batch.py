@@ -0,0 +1,207 @@
+import copy
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 2)))
+
+
+# ---------------- SOURCES ----------------
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "resume"
+
+
+def iter_documents(source):
+    """Yield ``(name, parse_data)`` from a directory of .json files or a .jsonl file.
+
+    JSONL lines may be a bare ``{"resume": ...}`` document or an object with a
+    ``parse_data`` key and an optional ``id``.
+    """
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if filename.lower().endswith(".json"):
+                with open(os.path.join(source, filename), encoding="utf-8") as f:
+                    yield os.path.splitext(filename)[0], json.load(f)
+        return
+
+    with open(source, encoding="utf-8") as f:
+        for idx, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "parse_data" in record:
+                yield str(record.get("id") or idx), record["parse_data"]
+            else:
+                yield str(idx), record
+
+
+def iter_cached_documents():
+    """Yield every parse_data document stored in the result cache."""
+    import cache
+
+    result_cache = cache.get_cache()
+    if result_cache is None:
+        print("[ERROR] The result cache is disabled (CACHE_ENABLED=0)")
+        return
+    skipped = 0
+    for key, value in result_cache.iter_entries(cache.PARSE_DATA):
+        try:
+            document = json.loads(value)
+        except json.JSONDecodeError:
+            skipped += 1
+            continue
+        yield key.split(":", 1)[0], document
+    if skipped:
+        print(f"[WARN] Skipped {skipped} cached document(s) that are not valid JSON")
+
+
+# ---------------- WORKERS ----------------
+
+
+def init_worker():
+    """Load fonts, styles and images once per worker process."""
+    from reportlab.pdfbase import pdfmetrics
+
+    import main  # builds the paragraph styles
+
+    for font in ("Helvetica", "Helvetica-Bold"):
+        pdfmetrics.getFont(font)
+    for path in (
+        "refernce/logoWhite.png",
+        "assets/phone.png",
+        "assets/email.png",
+        "assets/linkedin.png",
+        "assets/github.png",
+    ):
+        image = main.load_image(path)
+        if image is not None:
+            image.getRGBData()  # force the decode now rather than on first page
+
+
+def render_one(job):
+    from main import generate_resume_pdf
+
+    name, document, output_file, show_contact = job
+    started = time.perf_counter()
+    try:
+        generate_resume_pdf(document, show_contact=show_contact, output_file=output_file)
+    except Exception as e:
+        return name, None, time.perf_counter() - started, str(e)
+    return name, output_file, time.perf_counter() - started, None
+
+
+# ---------------- BULK RENDER ----------------
+
+
+def render_many(documents, output_dir, workers=RENDER_WORKERS, show_contact=True):
+    """Render ``(name, parse_data)`` pairs to ``output_dir`` across processes."""
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = (
+        (name, document, os.path.join(output_dir, f"{_safe_name(name)}.pdf"), show_contact)
+        for name, document in documents
+    )
+
+    rendered, failed = 0, 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        for name, path, seconds, error in pool.map(render_one, jobs, chunksize=8):
+            if error:
+                failed += 1
+                print(f"[ERROR] {name}: {error}")
+            else:
+                rendered += 1
+    elapsed = time.perf_counter() - started
+
+    rate = rendered / elapsed if elapsed else 0.0
+    print(
+        f"[INFO] Rendered {rendered} PDF(s), {failed} failed in {elapsed:.1f}s "
+        f"({rate:.2f} PDFs/sec, {workers} workers)"
+    )
+    return {"rendered": rendered, "failed": failed, "seconds": elapsed, "pdfs_per_sec": rate}
+
+
+# ---------------- STRESS CHECK ----------------
+
+
+def _stress_documents(count):
+    """Fixture variants of different lengths so page breaks land differently."""
+    from main import state
+
+    documents = []
+    for i in range(count):
+        document = copy.deepcopy(state)
+        resume = document["resume"]
+        resume["name"] = f"Stress Candidate {i}"
+        resume["sections"]["Career Summary"] *= 1 + i % 5
+        documents.append(document)
+    return documents
+
+
+def _render_bytes(document):
+    from main import render_resume_bytes
+
+    return render_resume_bytes(document, show_contact=True)
+
+
+def stress_render(threads=8, documents=32, rounds=5):
+    """Render documents concurrently and compare with serial renders byte for byte.
+
+    Any state shared between renders (page counters, styles, canvases) shows up
+    as a mismatch. Returns the number of mismatching renders.
+    """
+    from reportlab import rl_config
+
+    previous, rl_config.invariant = rl_config.invariant, 1  # stable ids/dates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # force threads to interleave mid-render
+    # Per-section INFO logging serializes threads on the handler lock and hides races.
+    render_logger = logging.getLogger("resume_pdf_generator")
+    level = render_logger.level
+    render_logger.setLevel(logging.WARNING)
+    try:
+        docs = _stress_documents(documents)
+        expected = [_render_bytes(d) for d in docs]
+        mismatches = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in range(rounds):
+                for idx, output in enumerate(pool.map(_render_bytes, docs)):
+                    if output != expected[idx]:
+                        mismatches += 1
+                        print(f"[ERROR] Concurrent render of document {idx} differs from serial render")
+        elapsed = time.perf_counter() - started
+    finally:
+        rl_config.invariant = previous
+        sys.setswitchinterval(interval)
+        render_logger.setLevel(level)
+
+    total = documents * rounds
+    print(
+        f"[INFO] Stress render: {total} renders on {threads} threads in {elapsed:.1f}s, "
+        f"{mismatches} mismatch(es)"
+    )
+    return mismatches
+
+
+def run_stress(args):
+    return 1 if stress_render(args.threads, args.documents, args.rounds) else 0
+
+
+def run_render(args):
+    if args.from_cache:
+        documents = iter_cached_documents()
+    elif args.source:
+        documents = iter_documents(args.source)
+    else:
+        print("[ERROR] Pass a directory/.jsonl source or --from-cache")
+        return 2
+    result = render_many(
+        documents, args.output, workers=args.workers, show_contact=not args.no_contact
+    )
+    return 1 if result["failed"] else 0
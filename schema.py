@@ -0,0 +1,107 @@
+CONTACT_KEYS = ("phone", "email", "linkedin", "github", "location")
+
+# fields directly under "resume", then the ones under "resume.sections"
+TOP_FIELDS = ("name", "summary", "contact")
+SECTION_FIELDS = (
+    "Career Summary",
+    "Professional History",
+    "Skillset",
+    "Project Showcase",
+    "Education",
+)
+FIELDS = TOP_FIELDS + SECTION_FIELDS
+
+
+def _strings(value, where):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{where} must be a list of strings")
+    return value
+
+
+def _entries(value, where, string_keys, list_keys):
+    if not isinstance(value, list):
+        raise ValueError(f"{where} must be a list")
+    for entry in value:
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where} entries must be objects")
+        for key in string_keys:
+            entry.setdefault(key, "")
+        for key in list_keys:
+            _strings(entry.setdefault(key, []), f"{where}.{key}")
+    return value
+
+
+def _name(value):
+    if not isinstance(value, str):
+        raise ValueError("name must be a string")
+    return value
+
+
+def _contact(value):
+    if not isinstance(value, dict):
+        raise ValueError("contact must be an object")
+    for key in CONTACT_KEYS:
+        value.setdefault(key, "None")
+    return value
+
+
+def _skillset(value):
+    if not isinstance(value, dict):
+        raise ValueError("Skillset must be an object")
+    return value
+
+
+CHECKS = {
+    "name": _name,
+    "summary": lambda v: _strings(v, "summary"),
+    "contact": _contact,
+    "Career Summary": lambda v: _strings(v, "Career Summary"),
+    "Professional History": lambda v: _entries(
+        v, "Professional History", ("title", "company", "timespan"), ("points",)
+    ),
+    "Skillset": _skillset,
+    "Project Showcase": lambda v: _entries(
+        v, "Project Showcase", ("title",), ("technologies", "points")
+    ),
+    "Education": lambda v: _strings(v, "Education"),
+}
+
+
+def empty(field):
+    if field == "name":
+        return ""
+    if field in ("contact", "Skillset"):
+        return {}
+    return []
+
+
+def validate_field(field, value):
+    """Check one field's value; returns it with missing keys filled, or raises ValueError."""
+    return CHECKS[field](value)
+
+
+def assemble(fields):
+    """``{"resume": {...}}`` from ``{field: value}``; absent fields are left out."""
+    resume = {key: fields[key] for key in TOP_FIELDS if key in fields}
+    resume["sections"] = {key: fields[key] for key in SECTION_FIELDS if key in fields}
+    return {"resume": resume}
+
+
+def validate(parse_data):
+    """Check parse_data against the prompt's schema, filling missing keys.
+
+    Missing fields get empty values; a value of the wrong type raises
+    ValueError.
+    """
+    resume = parse_data.get("resume") if isinstance(parse_data, dict) else None
+    if not isinstance(resume, dict):
+        raise ValueError("parse_data must contain a resume object")
+    sections = resume.setdefault("sections", {})
+    if not isinstance(sections, dict):
+        raise ValueError("resume.sections must be an object")
+
+    for field in TOP_FIELDS:
+        validate_field(field, resume.setdefault(field, empty(field)))
+    for field in SECTION_FIELDS:
+        validate_field(field, sections.setdefault(field, empty(field)))
+    return parse_data
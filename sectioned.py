@@ -0,0 +1,124 @@
+import os
+import threading
+
+import compaction
+import schema
+from ratelimit import estimate_tokens
+
+# ---------------- CONFIG ----------------
+
+# Off by default: every group resends the system prompt, so a split resume
+# costs several times the input tokens (and LLM_TPM budget) of one call.
+SECTION_PARALLEL = os.getenv("LLM_SECTION_PARALLEL", "0") == "1"
+# shorter resumes are extracted in a single call
+SECTION_MIN_TOKENS = int(os.getenv("LLM_SECTION_MIN_TOKENS", "1500"))
+# section calls in flight across the whole process, not per resume: every
+# dispatcher LLM worker splitting at once must not multiply the fan-out
+SECTION_WORKERS = int(os.getenv("LLM_SECTION_WORKERS", "5"))
+SECTION_SLOTS = threading.BoundedSemaphore(SECTION_WORKERS)
+
+# group -> (top-level resume keys, section keys, what the prompt asks for)
+GROUPS = {
+    "profile": (
+        ("name", "summary", "contact"),
+        (),
+        "the candidate's name, summary and contact details",
+    ),
+    "experience": (
+        (),
+        ("Professional History", "Career Summary"),
+        "the Professional History and the Career Summary",
+    ),
+    "skills": ((), ("Skillset",), "the Skillset"),
+    "projects": ((), ("Project Showcase",), "the Project Showcase"),
+    "education": ((), ("Education",), "the Education"),
+}
+
+# words in a heading -> group; headings that match nothing stay with the
+# previous group (they are usually sub-headings such as a company name)
+HEADING_WORDS = (
+    ("project", "projects"),
+    ("experience", "experience"),
+    ("employment", "experience"),
+    ("work history", "experience"),
+    ("career", "experience"),
+    ("skill", "skills"),
+    ("technolog", "skills"),
+    ("competenc", "skills"),
+    ("tools", "skills"),
+    ("education", "education"),
+    ("academic", "education"),
+    ("qualification", "education"),
+    ("certification", "education"),
+    ("summary", "profile"),
+    ("profile", "profile"),
+    ("objective", "profile"),
+    ("about", "profile"),
+)
+
+
+def _group_for(heading, current):
+    bare = heading.strip("#*_: ").lower()
+    for word, group in HEADING_WORDS:
+        if word in bare:
+            return group
+    return current
+
+
+def plan(content):
+    """Split ``content`` into ``{group: text}`` for section-parallel extraction.
+
+    The text before the first heading (name, contact line) and the links
+    appendix go to the profile group. Returns None when the mode is off, the
+    resume is short, or fewer than two groups were found; the caller then
+    makes a single call.
+    """
+    if not SECTION_PARALLEL or estimate_tokens(content) < SECTION_MIN_TOKENS:
+        return None
+
+    body, urls = compaction.split_links(content)
+    texts, group = {}, "profile"
+    for heading, lines in compaction.split_sections(body.splitlines()):
+        if heading:
+            group = _group_for(heading, group)
+        block = "\n".join(([heading] if heading else []) + lines).strip()
+        if block:
+            texts.setdefault(group, []).append(block)
+    if urls:
+        texts.setdefault("profile", []).append(
+            f"{compaction.LINKS_HEADER}\n" + "\n".join(f"- {url}" for url in urls)
+        )
+
+    if len(texts) < 2:
+        return None
+    return {group: "\n\n".join(blocks) for group, blocks in texts.items()}
+
+
+def instruction(group):
+    """Human-prompt lead-in asking for one group's keys only."""
+    return (
+        f"Extract ONLY {GROUPS[group][2]} from the following part of a resume. "
+        "Return the same JSON format, leaving every other field empty "
+        '("" for strings, [] for arrays, {} for objects):'
+    )
+
+
+def merge(partials):
+    """Combine ``{group: parse_data}`` into one validated parse_data."""
+    resume = {"name": "", "summary": [], "contact": {}, "sections": {}}
+    for group, data in partials.items():
+        keys, section_keys, _ = GROUPS[group]
+        partial = data.get("resume", {}) if isinstance(data, dict) else {}
+        for key in keys:
+            if key in partial:
+                resume[key] = partial[key]
+        sections = partial.get("sections") or {}
+        for key in section_keys:
+            if key in sections:
+                resume["sections"][key] = sections[key]
+    return schema.validate({"resume": resume})
+
+
+def cache_tag():
+    """Identifies the extraction mode in the parse_data cache key."""
+    return f"split{SECTION_MIN_TOKENS}" if SECTION_PARALLEL else "single"
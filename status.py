@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# ---------------- CONFIG ----------------
+
+STATUS_DB = os.getenv("STATUS_DB", os.path.join("LogFolder", "status.db"))
+STATUS_ENABLED = os.getenv("STATUS_ENABLED", "1") != "0"
+# finished jobs older than this are pruned
+STATUS_RETENTION_SECONDS = float(os.getenv("STATUS_RETENTION_SECONDS", str(7 * 86400)))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+COLUMNS = (
+    "job_id",
+    "file_path",
+    "source",
+    "stage",
+    "status",
+    "timings",
+    "error",
+    "output_file",
+    "started_at",
+    "updated_at",
+    "seq",
+)
+
+
+def _row(row):
+    job = dict(zip(COLUMNS, row))
+    job["timings"] = json.loads(job["timings"]) if job["timings"] else {}
+    return job
+
+
+class StatusStore:
+    """Live pipeline status shared between the workers and the Streamlit app.
+
+    Writers (the dispatcher, worker.py) record every job's current stage,
+    timings and error plus gauges such as queue length. Every job update
+    takes the next ``seq`` number, so a reader can ask for ``changes(since)``
+    and only read rows that changed since its last poll. The last number
+    handed out is kept in its own row, so pruning old jobs never lets a seq
+    be reused below a reader's cursor.
+    """
+
+    def __init__(self, path=STATUS_DB):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # status may lose the last write on power loss
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                file_path TEXT,
+                source TEXT,
+                stage TEXT,
+                status TEXT NOT NULL,
+                timings TEXT,
+                error TEXT,
+                output_file TEXT,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_seq ON jobs (seq)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated_at)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sequence (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+        # stores created before the sequence row continue from their jobs
+        self._conn.execute(
+            "INSERT OR IGNORE INTO sequence (id, seq) SELECT 1, COALESCE(MAX(seq), 0) FROM jobs"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS gauges (
+                name TEXT PRIMARY KEY,
+                value REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    # ---------------- WRITERS ----------------
+
+    def _upsert(self, job_id, **fields):
+        try:
+            self._write(job_id, fields)
+        except sqlite3.Error as e:
+            # status is advisory: a busy or broken store must not fail a job
+            print(f"[WARN] Status update for {job_id} failed: {e}")
+
+    def _write(self, job_id, fields):
+        now = time.time()
+        fields["updated_at"] = now
+        if "timings" in fields:
+            fields["timings"] = json.dumps(fields["timings"])
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("UPDATE sequence SET seq = seq + 1 WHERE id = 1")
+                seq = self._conn.execute("SELECT seq FROM sequence WHERE id = 1").fetchone()[0]
+                fields["seq"] = seq
+                names = ", ".join(fields)
+                self._conn.execute(
+                    f"INSERT INTO jobs (job_id, started_at, status, {names}) "
+                    f"VALUES (?, ?, ?, {', '.join('?' * len(fields))}) "
+                    f"ON CONFLICT (job_id) DO UPDATE SET "
+                    + ", ".join(f"{name} = excluded.{name}" for name in fields),
+                    (job_id, now, fields.get("status", QUEUED), *fields.values()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def job_queued(self, job_id, file_path, source):
+        self._upsert(job_id, file_path=file_path, source=source, status=QUEUED, stage=None)
+
+    def job_stage(self, job_id, stage, timings=None):
+        self._upsert(job_id, stage=stage, status=RUNNING, timings=timings or {})
+
+    def job_finished(self, job_id, timings, error=None, output_file=None):
+        self._upsert(
+            job_id,
+            status=FAILED if error else DONE,
+            timings=timings,
+            error=error,
+            output_file=output_file,
+        )
+
+    def set_gauge(self, name, value):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO gauges VALUES (?, ?, ?)", (name, value, time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"[WARN] Status gauge {name} failed: {e}")
+
+    def prune(self, retention_seconds=STATUS_RETENTION_SECONDS):
+        cutoff = time.time() - retention_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    # ---------------- READERS ----------------
+
+    def changes(self, since=0, limit=500):
+        """Jobs updated after ``since`` (a seq), oldest first, and the new cursor."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            ).fetchall()
+        jobs = [_row(row) for row in rows]
+        return jobs, (jobs[-1]["seq"] if jobs else since)
+
+    def latest_seq(self):
+        with self._lock:
+            return self._conn.execute("SELECT seq FROM sequence WHERE id = 1").fetchone()[0]
+
+    def gauges(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT name, value, updated_at FROM gauges").fetchall()
+        return {name: {"value": value, "updated_at": updated_at} for name, value, updated_at in rows}
+
+    def summary(self, window_seconds=300):
+        """Counts by status plus jobs finished per minute over the last window."""
+        since = time.time() - window_seconds
+        with self._lock:
+            counts = dict(
+                self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+            )
+            finished = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM jobs WHERE status IN (?, ?) AND updated_at >= ? "
+                    "GROUP BY status",
+                    (DONE, FAILED, since),
+                ).fetchall()
+            )
+        return {
+            "counts": counts,
+            "done_per_minute": finished.get(DONE, 0) * 60 / window_seconds,
+            "failed_in_window": finished.get(FAILED, 0),
+            "window_seconds": window_seconds,
+        }
+
+
+_STORE = None
+_STORE_PID = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_status_store():
+    """Process-wide store, or None when STATUS_ENABLED=0 (one connection per PID)."""
+    global _STORE, _STORE_PID
+    if not STATUS_ENABLED:
+        return None
+    with _STORE_LOCK:
+        if _STORE is None or _STORE_PID != os.getpid():
+            _STORE = StatusStore()
+            _STORE_PID = os.getpid()
+        return _STORE
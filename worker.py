@@ -0,0 +1,142 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import time
+
+import metrics
+from jobs import JOB_OUTPUT_DIR, JobQueue
+from status import get_status_store
+
+POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+STALE_CHECK_INTERVAL = 60
+
+
+def process_job(job, status=None):
+    """Run the agent.py stages for one job; returns ``(state, timings, error)``.
+
+    With a ``status`` store every stage transition is recorded there.
+    """
+    from dispatcher import STAGES, next_stage, run_stage
+
+    os.makedirs(JOB_OUTPUT_DIR, exist_ok=True)
+    state = {
+        "file_path": job["upload_path"],
+        "output_file": os.path.join(JOB_OUTPUT_DIR, f"{job['id']}.pdf"),
+    }
+    timings = {}
+    index = 0
+    while index < len(STAGES):
+        stage, node_name = STAGES[index]
+        if status:
+            status.job_stage(job["id"], stage, timings)
+        try:
+            result, elapsed = run_stage(node_name, state)
+        except Exception as e:
+            return state, timings, f"{stage}: {e}"
+        timings[stage] = round(elapsed, 4)
+        if not isinstance(result, dict):
+            return state, timings, f"{stage}: {result}"
+        if result.get("error"):
+            return result, timings, f"{stage}: {result['error']}"
+        state = result
+        index = next_stage(index, state)
+    return state, timings, None
+
+
+def run_worker(worker_id=None, poll_interval=POLL_INTERVAL, metrics_port=None):
+    """Claim and process jobs until interrupted."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue()
+    status = get_status_store()
+    queued = None
+    if metrics_port:
+        metrics.REGISTRY.gauge(
+            "resume_jobs_by_status", "Jobs in the queue by status", queue.counts, label="status"
+        )
+        metrics.serve_metrics(metrics_port)
+    print(f"[INFO] Worker {worker_id} polling {queue.path}")
+    last_stale_check = 0.0
+
+    try:
+        while True:
+            if time.time() - last_stale_check > STALE_CHECK_INTERVAL:
+                queue.requeue_stale()
+                last_stale_check = time.time()
+
+            job = queue.claim(worker_id)
+            if status:
+                waiting = queue.counts().get("queued", 0)
+                if waiting != queued:
+                    status.set_gauge("jobs_queued", waiting)
+                    queued = waiting
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+
+            print(f"[INFO] {worker_id} processing job {job['id']} ({job['filename']})")
+            started = time.perf_counter()
+            state, timings, error = process_job(job, status)
+            metrics.record_job(
+                state.get("metrics"),
+                "failed" if error else "done",
+                source="worker",
+                total_seconds=round(time.perf_counter() - started, 4),
+                error=error,
+                failed_stage=error.split(":", 1)[0] if error else None,
+                job_id=job["id"],
+                worker=worker_id,
+                attempt=job["attempts"],
+            )
+            if status:
+                total = round(time.perf_counter() - started, 4)
+                status.job_finished(
+                    job["id"], {**timings, "total": total}, error, state.get("output_file")
+                )
+            if error:
+                print(f"[ERROR] Job {job['id']} failed at {error}")
+                queue.fail(job["id"], error, timings)
+            else:
+                queue.complete(job["id"], state.get("output_file"), timings)
+                print(f"[INFO] Job {job['id']} done: {state.get('output_file')}")
+    except KeyboardInterrupt:
+        print(f"[INFO] Worker {worker_id} stopping")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume job queue worker")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve /metrics here; worker N of --processes uses port + N",
+    )
+    args = parser.parse_args()
+
+    def port(index):
+        return args.metrics_port + index if args.metrics_port else None
+
+    if args.processes == 1:
+        run_worker(poll_interval=args.poll_interval, metrics_port=port(0))
+        return
+
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            kwargs={"poll_interval": args.poll_interval, "metrics_port": port(i)},
+        )
+        for i in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()